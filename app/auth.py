@@ -9,18 +9,21 @@ This module provides authentication handlers for:
 import os
 import logging
 import secrets
+import sys
+import threading
 import time
-from datetime import datetime, timedelta
+import types
+from datetime import timedelta
 from typing import Dict, List, Optional, Tuple, Union, Any, Callable
 import base64
-import json
 import hashlib
 import hmac
 
+import orjson
+from cachetools import TLRUCache, TTLCache
 from fastapi import Depends, FastAPI, HTTPException, Security, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.security.api_key import APIKeyHeader
 from pydantic import BaseModel
 
 from .errors import TrinoAuthError
@@ -28,31 +31,52 @@ from .errors import TrinoAuthError
 logger = logging.getLogger(__name__)
 
 # Configuration from environment variables
-JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", secrets.token_hex(32))
+# An empty value (e.g. passed through by docker-compose) counts as unset
+JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or secrets.token_hex(32)
 JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_MINUTES = int(os.environ.get("JWT_EXPIRATION_MINUTES", "60"))
+_JWT_SECRET_BYTES = JWT_SECRET_KEY.encode()
+
+# The JWT header never changes for the process lifetime, so encode it once
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(
+    orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"})
+).rstrip(b"=")
+
+# Verified JWTs are cached briefly so a replayed bearer token skips the
+# base64/JSON/HMAC work on every request
+JWT_CACHE_TTL_SECONDS = 30
+JWT_CACHE_MAXSIZE = 10000
 
 # Basic auth credentials - these would typically come from a database or config file
 # For simplicity, we're using environment variables
-BASIC_AUTH_USERS = {}
+_basic_auth_users: Dict[str, str] = {}
 BASIC_AUTH_USERS_STR = os.environ.get("BASIC_AUTH_USERS", "")
 if BASIC_AUTH_USERS_STR:
     # Format: "username1:password1,username2:password2"
     for user_pass in BASIC_AUTH_USERS_STR.split(","):
         parts = user_pass.strip().split(":")
         if len(parts) == 2:
-            BASIC_AUTH_USERS[parts[0]] = parts[1]
+            _basic_auth_users[sys.intern(parts[0])] = parts[1]
+
+# Read-only view, since the user table is fixed after startup
+BASIC_AUTH_USERS = types.MappingProxyType(_basic_auth_users)
+
+# Successful Basic logins are cached briefly so replayed credentials skip
+# verify_password, which is expected to become a slow KDF in production
+BASIC_AUTH_CACHE_TTL_SECONDS = 30
+BASIC_AUTH_CACHE_MAXSIZE = 10000
 
 # Flag to enable/disable authentication
 AUTH_ENABLED = os.environ.get("AUTH_ENABLED", "false").lower() == "true"
 
 # Auth mode: none, basic, jwt, or all
 AUTH_MODE = os.environ.get("AUTH_MODE", "none").lower()
+_AUTH_BEARER_ALLOWED = AUTH_MODE in ("bearer", "all")
+_AUTH_BASIC_ALLOWED = AUTH_MODE in ("basic", "all")
 
 # Security schemes
 basic_security = HTTPBasic(auto_error=False)
 bearer_security = HTTPBearer(auto_error=False)
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 class TokenData(BaseModel):
     """Data model for JWT token claims."""
@@ -61,6 +85,23 @@ class TokenData(BaseModel):
     exp: Optional[int] = None
 
 
+def _jwt_cache_ttu(key: bytes, token_data: TokenData, now: float) -> float:
+    """Expire cached tokens after the cache TTL or at token expiry, whichever comes first."""
+    ttl = JWT_CACHE_TTL_SECONDS
+    if token_data.exp is not None:
+        ttl = min(ttl, token_data.exp - time.time())
+    return now + ttl
+
+
+_jwt_cache: TLRUCache = TLRUCache(maxsize=JWT_CACHE_MAXSIZE, ttu=_jwt_cache_ttu)
+_jwt_cache_lock = threading.Lock()
+
+# Keyed by (username, salted password digest) so plaintext passwords are never held
+_basic_auth_cache: TTLCache = TTLCache(maxsize=BASIC_AUTH_CACHE_MAXSIZE, ttl=BASIC_AUTH_CACHE_TTL_SECONDS)
+_basic_auth_cache_lock = threading.Lock()
+_BASIC_AUTH_CACHE_SALT = secrets.token_bytes(16)
+
+
 def is_auth_enabled() -> bool:
     """Check if authentication is enabled."""
     return AUTH_ENABLED
@@ -83,8 +124,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     # return pwd_context.verify(plain_password, hashed_password)
     
-    # Simple implementation for demo purposes
-    return plain_password == hashed_password
+    # Simple implementation for demo purposes, compared in constant time
+    return hmac.compare_digest(plain_password.encode(), hashed_password.encode())
 
 
 def get_password_hash(password: str) -> str:
@@ -117,8 +158,19 @@ def authenticate_user(username: str, password: str) -> bool:
     if username not in BASIC_AUTH_USERS:
         return False
     
+    cache_key = (username, hmac.digest(_BASIC_AUTH_CACHE_SALT, password.encode(), "sha256"))
+    with _basic_auth_cache_lock:
+        if cache_key in _basic_auth_cache:
+            return True
+    
     stored_password = BASIC_AUTH_USERS[username]
-    return verify_password(password, stored_password)
+    if not verify_password(password, stored_password):
+        return False
+    
+    # Only successful logins are cached
+    with _basic_auth_cache_lock:
+        _basic_auth_cache[cache_key] = True
+    return True
 
 
 def create_jwt_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -134,24 +186,19 @@ def create_jwt_token(data: Dict[str, Any], expires_delta: Optional[timedelta] =
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRATION_MINUTES)
-    
-    to_encode.update({"exp": expire.timestamp()})
+    lifetime = expires_delta.total_seconds() if expires_delta else JWT_EXPIRATION_MINUTES * 60
+    to_encode["exp"] = int(time.time() + lifetime)
     
     # In a real implementation, use a proper JWT library:
     # import jwt
     # encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     
     # Simple implementation for demo purposes
-    header = {"alg": JWT_ALGORITHM, "typ": "JWT"}
-    header_bytes = base64.urlsafe_b64encode(json.dumps(header).encode()).rstrip(b"=")
-    payload_bytes = base64.urlsafe_b64encode(json.dumps(to_encode).encode()).rstrip(b"=")
+    header_bytes = _JWT_HEADER_B64
+    payload_bytes = base64.urlsafe_b64encode(orjson.dumps(to_encode)).rstrip(b"=")
     
     message = header_bytes + b"." + payload_bytes
-    signature = hmac.new(JWT_SECRET_KEY.encode(), message, hashlib.sha256).digest()
+    signature = hmac.digest(_JWT_SECRET_BYTES, message, "sha256")
     signature_bytes = base64.urlsafe_b64encode(signature).rstrip(b"=")
     
     encoded_jwt = (header_bytes + b"." + payload_bytes + b"." + signature_bytes).decode()
@@ -197,14 +244,20 @@ def decode_jwt_token(token: str) -> TokenData:
     #         headers={"WWW-Authenticate": "Bearer"},
     #     )
     
+    # Tokens are keyed by a truncated digest so raw tokens are never stored
+    cache_key = hashlib.sha256(token.encode()).digest()[:16]
+    with _jwt_cache_lock:
+        token_data = _jwt_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+    
     # Simple implementation for demo purposes
     try:
         # Split the token into header, payload, and signature
         header_b64, payload_b64, signature_b64 = token.split(".")
         
-        # Decode the payload
-        payload_json = base64.urlsafe_b64decode(payload_b64 + "=" * (-len(payload_b64) % 4)).decode()
-        payload = json.loads(payload_json)
+        # Decode the payload (the decoder ignores surplus padding)
+        payload = orjson.loads(base64.urlsafe_b64decode(payload_b64 + "==="))
         
         # Verify the token hasn't expired
         exp = payload.get("exp")
@@ -227,8 +280,8 @@ def decode_jwt_token(token: str) -> TokenData:
             
         # Verify the signature
         message = (header_b64 + "." + payload_b64).encode()
-        expected_signature = hmac.new(JWT_SECRET_KEY.encode(), message, hashlib.sha256).digest()
-        actual_signature = base64.urlsafe_b64decode(signature_b64 + "=" * (-len(signature_b64) % 4))
+        expected_signature = hmac.digest(_JWT_SECRET_BYTES, message, "sha256")
+        actual_signature = base64.urlsafe_b64decode(signature_b64 + "===")
         
         if not hmac.compare_digest(expected_signature, actual_signature):
             raise HTTPException(
@@ -237,10 +290,16 @@ def decode_jwt_token(token: str) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return TokenData(username=username, scopes=scopes, exp=exp)
+        # Only successfully verified tokens are cached
+        token_data = TokenData(username=username, scopes=scopes, exp=exp)
+        with _jwt_cache_lock:
+            _jwt_cache[cache_key] = token_data
+        return token_data
         
-    except Exception as e:
-        logger.error(f"Error decoding JWT token: {str(e)}")
+    except (ValueError, TypeError, AttributeError) as e:
+        # Malformed segments, base64, JSON or claim types; HTTPExceptions
+        # raised above propagate with their specific detail
+        logger.error("Error decoding JWT token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -248,36 +307,29 @@ def decode_jwt_token(token: str) -> TokenData:
         )
 
 
-async def get_current_user_optional(
-    basic_credentials: Optional[HTTPBasicCredentials] = Depends(basic_security),
-    bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_security),
-    api_key: Optional[str] = Depends(api_key_header),
+def _resolve_user(
+    basic_credentials: Optional[HTTPBasicCredentials],
+    bearer_credentials: Optional[HTTPAuthorizationCredentials],
 ) -> Optional[str]:
     """
-    Get the current user from various authentication methods.
-    This is the dependency to use when authentication is optional.
+    Resolve the username from the supplied credentials.
+    
+    This does no I/O, so the async dependencies call it directly rather than
+    awaiting one another.
     
     Args:
         basic_credentials: Optional HTTP Basic Auth credentials
         bearer_credentials: Optional Bearer token credentials
-        api_key: Optional API key
         
     Returns:
         Username if authentication is successful, None otherwise
     """
     # If authentication is disabled, return None
-    if not is_auth_enabled():
-        return None
-    
-    # Check auth mode and use appropriate method
-    auth_mode = get_auth_mode()
-    
-    # If auth mode is none, return None
-    if auth_mode == "none":
+    if not AUTH_ENABLED:
         return None
     
     # Try bearer token auth if applicable
-    if (auth_mode == "bearer" or auth_mode == "all") and bearer_credentials:
+    if _AUTH_BEARER_ALLOWED and bearer_credentials:
         try:
             token_data = decode_jwt_token(bearer_credentials.credentials)
             return token_data.username
@@ -285,7 +337,7 @@ async def get_current_user_optional(
             pass
     
     # Try basic auth if applicable
-    if (auth_mode == "basic" or auth_mode == "all") and basic_credentials:
+    if _AUTH_BASIC_ALLOWED and basic_credentials:
         username = basic_credentials.username
         password = basic_credentials.password
         
@@ -296,10 +348,27 @@ async def get_current_user_optional(
     return None
 
 
+async def get_current_user_optional(
+    basic_credentials: Optional[HTTPBasicCredentials] = Depends(basic_security),
+    bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_security),
+) -> Optional[str]:
+    """
+    Get the current user from various authentication methods.
+    This is the dependency to use when authentication is optional.
+    
+    Args:
+        basic_credentials: Optional HTTP Basic Auth credentials
+        bearer_credentials: Optional Bearer token credentials
+        
+    Returns:
+        Username if authentication is successful, None otherwise
+    """
+    return _resolve_user(basic_credentials, bearer_credentials)
+
+
 async def get_current_user(
     basic_credentials: Optional[HTTPBasicCredentials] = Depends(basic_security),
     bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_security),
-    api_key: Optional[str] = Depends(api_key_header),
 ) -> str:
     """
     Get the current user from various authentication methods.
@@ -308,7 +377,6 @@ async def get_current_user(
     Args:
         basic_credentials: Optional HTTP Basic Auth credentials
         bearer_credentials: Optional Bearer token credentials
-        api_key: Optional API key
         
     Returns:
         Username if authentication is successful
@@ -317,10 +385,10 @@ async def get_current_user(
         HTTPException: If authentication fails
     """
     # If authentication is disabled, return a default user
-    if not is_auth_enabled():
+    if not AUTH_ENABLED:
         return "anonymous"
     
-    username = await get_current_user_optional(basic_credentials, bearer_credentials, api_key)
+    username = _resolve_user(basic_credentials, bearer_credentials)
     
     if username:
         return username
@@ -333,6 +401,34 @@ async def get_current_user(
     )
 
 
+def _no_user() -> None:
+    """Optional-user dependency used when authentication is disabled."""
+    return None
+
+
+def _anonymous_user() -> str:
+    """Required-user dependency used when authentication is disabled."""
+    return "anonymous"
+
+
+def user_dependency(required: bool = False) -> Callable[..., Optional[str]]:
+    """
+    Select the user dependency for a route.
+    
+    With authentication disabled this returns a parameterless callable, so
+    FastAPI never resolves the Basic/Bearer credential schemes for the route.
+    
+    Args:
+        required: Whether the route needs an authenticated user
+        
+    Returns:
+        A dependency callable to pass to Depends()
+    """
+    if not AUTH_ENABLED:
+        return _anonymous_user if required else _no_user
+    return get_current_user if required else get_current_user_optional
+
+
 def get_trino_auth_headers(username: str) -> Dict[str, str]:
     """
     Get Trino authentication headers for the given username.
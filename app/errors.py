@@ -4,6 +4,8 @@ Error handling module for Trino MCP client.
 This module defines error classes and utilities according to the JSON-RPC 2.0 specification:
 https://www.jsonrpc.org/specification#error_object
 """
+import re
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 
@@ -46,14 +48,28 @@ class MCPError(Exception):
         super().__init__(message)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the error to a JSON-RPC error object."""
-        error = {
+        """
+        Convert the error to a JSON-RPC error object.
+        
+        Errors without data return a shared dict per (code, message) pair,
+        so callers must not mutate the result.
+        """
+        if self.data is None:
+            return _error_object(self.code, self.message)
+        return {
             "code": self.code,
-            "message": self.message
+            "message": self.message,
+            "data": self.data
         }
-        if self.data is not None:
-            error["data"] = self.data
-        return error
+
+
+@lru_cache(maxsize=256)
+def _error_object(code: int, message: str) -> Dict[str, Any]:
+    """Build the shared JSON-RPC error object for a data-less error."""
+    return {
+        "code": code,
+        "message": message
+    }
 
 
 # JSON-RPC standard errors
@@ -130,42 +146,62 @@ class TrinoStateError(MCPError):
         super().__init__(ErrorCode.TRINO_STATE_ERROR, message, data)
 
 
+# Markers used to classify Trino error messages, matched in a single pass.
+# Only "syntax error" is case-insensitive, mirroring the original checks.
+_TRINO_ERROR_PATTERN = re.compile(
+    r"(?P<connection>Connection refused|Failed to establish a new connection)"
+    r"|(?P<auth>Invalid credentials|Authentication failed)"
+    r"|(?P<resource>does not exist)"
+    r"|(?P<syntax>(?i:syntax error))"
+    r"|(?P<line>line)"
+    r"|(?P<position>position)"
+    r"|(?P<timeout>exceeded the query timeout|execution time exceeded)"
+)
+_RESOURCE_KIND_PATTERN = re.compile(r"catalog|schema|table")
+
+
 def handle_trino_error(error: Exception) -> MCPError:
     """
     Convert a Trino-related exception to the appropriate MCPError.
     
     This function analyzes the error message and type to determine
-    the most appropriate MCPError subclass.
+    the most appropriate MCPError subclass. Errors that are already
+    MCPErrors are returned unchanged rather than wrapped again.
     """
+    if isinstance(error, MCPError):
+        return error
+    
     error_msg = str(error)
     error_data = {"original_error": error_msg}
+    markers = {match.lastgroup for match in _TRINO_ERROR_PATTERN.finditer(error_msg)}
     
-    if "Connection refused" in error_msg or "Failed to establish a new connection" in error_msg:
+    if "connection" in markers:
         return TrinoConnectionError(
             "Failed to connect to Trino server. Please check that the server is running and accessible.",
             error_data
         )
     
-    if "Invalid credentials" in error_msg or "Authentication failed" in error_msg:
+    if "auth" in markers:
         return TrinoAuthError(
             "Authentication failed. Please check your credentials.",
             error_data
         )
     
-    if "does not exist" in error_msg:
-        if "catalog" in error_msg:
+    if "resource" in markers:
+        kinds = set(_RESOURCE_KIND_PATTERN.findall(error_msg))
+        if "catalog" in kinds:
             return TrinoResourceError(f"Catalog not found: {error_msg}", error_data)
-        if "schema" in error_msg:
+        if "schema" in kinds:
             return TrinoResourceError(f"Schema not found: {error_msg}", error_data)
-        if "table" in error_msg:
+        if "table" in kinds:
             return TrinoResourceError(f"Table not found: {error_msg}", error_data)
         return TrinoResourceError(f"Resource not found: {error_msg}", error_data)
     
-    if "syntax error" in error_msg.lower() or "line" in error_msg and "position" in error_msg:
+    if "syntax" in markers or "line" in markers and "position" in markers:
         return TrinoSyntaxError(f"SQL syntax error: {error_msg}", error_data)
     
-    if "exceeded the query timeout" in error_msg or "execution time exceeded" in error_msg:
+    if "timeout" in markers:
         return TrinoTimeoutError(f"Query execution timed out: {error_msg}", error_data)
     
     # Default to the generic query error
-    return TrinoQueryError(f"Error executing Trino query: {error_msg}", error_data) 
\ No newline at end of file
+    return TrinoQueryError(f"Error executing Trino query: {error_msg}", error_data)
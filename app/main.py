@@ -1,30 +1,63 @@
 from pathlib import Path
 import os
 import logging
+import hashlib
 import json
+import msgspec
+import orjson
+from typing import Any
 from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, ValidationError
-from .rpc import dispatch_rpc
+from pydantic import BaseModel
+from .rpc import dispatch_rpc, run_blocking
 from . import trino_client
 from .errors import (
     MCPError, ParseError, InvalidRequest, MethodNotFound,
     InvalidParams, InternalError, ErrorCode
 )
 from .auth import (
-    get_current_user, get_current_user_optional, is_auth_enabled,
+    get_current_user, get_current_user_optional, user_dependency, is_auth_enabled,
     get_auth_mode, create_jwt_token, AUTH_ENABLED, AUTH_MODE,
     TokenData
 )
 
+class _JSONFormatter(logging.Formatter):
+    """Render log records as one-line JSON, skipping the strftime of %(asctime)s."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
 # Configure logging
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(_JSONFormatter())
 logging.basicConfig(
     level=logging.DEBUG,  # Changed from INFO to DEBUG for more details
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[_log_handler],
 )
 logger = logging.getLogger(__name__)
 
+
+class _LazyJSON:
+    """Pretty-print a payload only when a log record is actually emitted."""
+    
+    __slots__ = ("payload",)
+    
+    def __init__(self, payload):
+        self.payload = payload
+    
+    def __str__(self) -> str:
+        return json.dumps(self.payload, indent=2)
+
 # Get configuration from environment variables
 TRINO_HOST = os.environ.get("TRINO_HOST", "localhost")
 TRINO_PORT = int(os.environ.get("TRINO_PORT", "8080"))
@@ -33,23 +66,35 @@ TRINO_CATALOG = os.environ.get("TRINO_CATALOG", None)
 TRINO_SCHEMA = os.environ.get("TRINO_SCHEMA", None)
 TRINO_HTTP_SCHEME = os.environ.get("TRINO_HTTP_SCHEME", "http")
 TRINO_VERIFY_SSL = os.environ.get("TRINO_VERIFY_SSL", "true").lower() == "true"
+TRINO_TARGET_RESULT_SIZE = os.environ.get("TRINO_TARGET_RESULT_SIZE", None)
+
+app = FastAPI(title="Trino MCP Gateway", default_response_class=ORJSONResponse)
+
+
+@app.on_event("startup")
+def configure_trino_client():
+    """Configure the shared Trino client once the server starts."""
+    try:
+        trino_client.configure_client(
+            host=TRINO_HOST,
+            port=TRINO_PORT,
+            user=TRINO_USER,
+            catalog=TRINO_CATALOG,
+            schema=TRINO_SCHEMA,
+            http_scheme=TRINO_HTTP_SCHEME,
+            verify=TRINO_VERIFY_SSL,
+            target_result_size=TRINO_TARGET_RESULT_SIZE,
+        )
+        logger.info("Trino client configured to connect to %s://%s:%s", TRINO_HTTP_SCHEME, TRINO_HOST, TRINO_PORT)
+    except Exception as e:
+        logger.error("Failed to configure Trino client: %s", e)
+
+
+@app.on_event("shutdown")
+def close_trino_client():
+    """Release pooled Trino connections when the server stops."""
+    trino_client.close_client()
 
-# Configure the Trino client
-try:
-    trino_client.configure_client(
-        host=TRINO_HOST,
-        port=TRINO_PORT,
-        user=TRINO_USER,
-        catalog=TRINO_CATALOG,
-        schema=TRINO_SCHEMA,
-        http_scheme=TRINO_HTTP_SCHEME,
-        verify=TRINO_VERIFY_SSL,
-    )
-    logger.info(f"Trino client configured to connect to {TRINO_HTTP_SCHEME}://{TRINO_HOST}:{TRINO_PORT}")
-except Exception as e:
-    logger.error(f"Failed to configure Trino client: {str(e)}")
-
-app = FastAPI(title="Trino MCP Gateway")
 
 # Add CORS middleware
 app.add_middleware(
@@ -62,10 +107,27 @@ app.add_middleware(
 
 MANIFEST_PATH = Path(__file__).parent.parent / ".well-known" / "mcp" / "manifest.json"
 
+# The manifest is static, so it is read once and served from memory
+try:
+    MANIFEST_BYTES = MANIFEST_PATH.read_bytes()
+except OSError as e:
+    logger.error("Failed to read MCP manifest at %s: %s", MANIFEST_PATH, e)
+    MANIFEST_BYTES = None
+
+MANIFEST_HEADERS = {"Cache-Control": "public, max-age=3600"}
+if MANIFEST_BYTES is not None:
+    MANIFEST_HEADERS["ETag"] = f'"{hashlib.sha256(MANIFEST_BYTES).hexdigest()[:16]}"'
+
 
 @app.get("/.well-known/mcp/manifest.json")
-def manifest():
-    return FileResponse(MANIFEST_PATH)
+def manifest(req: Request):
+    if MANIFEST_BYTES is None:
+        raise HTTPException(status_code=404, detail="Manifest not found")
+    
+    if req.headers.get("if-none-match") == MANIFEST_HEADERS["ETag"]:
+        return Response(status_code=304, headers=MANIFEST_HEADERS)
+    
+    return Response(content=MANIFEST_BYTES, media_type="application/json", headers=MANIFEST_HEADERS)
 
 
 @app.get("/health")
@@ -73,7 +135,7 @@ async def health_check():
     """Health check endpoint that verifies Trino connectivity."""
     client = trino_client.get_client()
     
-    if not client.check_connection():
+    if not await run_blocking(client.check_connection):
         raise HTTPException(
             status_code=503,
             detail=f"Cannot connect to Trino server at {client.http_scheme}://{client.host}:{client.port}"
@@ -93,7 +155,7 @@ async def health_check():
 
 
 @app.get("/auth/status")
-async def auth_status(username: str = Depends(get_current_user_optional)):
+async def auth_status(username: str = Depends(user_dependency())):
     """
     Get authentication status.
     
@@ -147,122 +209,137 @@ async def login_for_token(request: LoginRequest):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-class RPCEnvelope(BaseModel):
+class RPCEnvelope(msgspec.Struct):
     jsonrpc: str
-    id: str | int | None
     method: str
+    id: str | int | None
     params: dict | None = None
 
 
+# Reused across requests; parses and validates the body in a single pass
+_RPC_DECODER = msgspec.json.Decoder(RPCEnvelope)
+
+# The auth failure body never varies, so it is serialized once
+_AUTH_REQUIRED_BYTES = orjson.dumps({
+    "jsonrpc": "2.0",
+    "error": {
+        "code": ErrorCode.TRINO_AUTH_ERROR,
+        "message": "Authentication required"
+    },
+    "id": None
+})
+_AUTH_REQUIRED_HEADERS = {"WWW-Authenticate": 'Basic realm="MCP API", Bearer'}
+
+_ERROR_ENVELOPE_TEMPLATE = b'{"jsonrpc":"2.0","id":%s,"error":%s}'
+
+
+def _error_response(rpc_id: Any, error: MCPError, status_code: int = 200) -> Response:
+    """Serialize a JSON-RPC error envelope straight to bytes."""
+    body = _ERROR_ENVELOPE_TEMPLATE % (orjson.dumps(rpc_id), orjson.dumps(error.to_dict()))
+    logger.debug("Sending error response: %s", body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+# Largest buffer allocated up front from a client-supplied Content-Length;
+# the header is untrusted, so anything beyond this is only allocated as
+# the body actually arrives
+_MAX_BODY_PRESIZE = 64 * 1024
+
+
+async def _read_body(req: Request) -> bytearray:
+    """
+    Stream the request body into one buffer.
+    
+    The buffer is presized from Content-Length, up to _MAX_BODY_PRESIZE, so
+    typical bodies are copied once instead of being collected in chunks and
+    then joined.
+    """
+    length = req.headers.get("content-length", "")
+    buffer = bytearray(min(int(length), _MAX_BODY_PRESIZE) if length.isdigit() else 0)
+    received = 0
+    async for chunk in req.stream():
+        # Slice assignment grows the buffer if the body is longer than declared
+        buffer[received:received + len(chunk)] = chunk
+        received += len(chunk)
+    del buffer[received:]
+    return buffer
+
+
 @app.post("/mcp")
-async def mcp_endpoint(req: Request, username: str = Depends(get_current_user_optional)):
+async def mcp_endpoint(req: Request, username: str = Depends(user_dependency())):
     # Log headers for debugging
-    logger.debug(f"Received MCP request with headers: {dict(req.headers)}")
+    logger.debug("Received MCP request with headers: %s", req.headers)
     
     # Handle authentication
     if is_auth_enabled() and username is None:
         logger.warning("Authentication required but not provided")
-        return JSONResponse(
+        return Response(
+            content=_AUTH_REQUIRED_BYTES,
             status_code=401,
-            content={
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": ErrorCode.TRINO_AUTH_ERROR,
-                    "message": "Authentication required"
-                },
-                "id": None
-            },
-            headers={"WWW-Authenticate": 'Basic realm="MCP API", Bearer'}
+            media_type="application/json",
+            headers=_AUTH_REQUIRED_HEADERS,
         )
     
     # Set the Trino user based on the authenticated user or default
     trino_user = username or "anonymous"
-    logger.debug(f"Using Trino user: {trino_user}")
+    logger.debug("Using Trino user: %s", trino_user)
     
     # Log request body for debugging
-    body = await req.body()
-    logger.debug(f"Received raw request body: {body.decode('utf-8')}")
+    body = await _read_body(req)
+    logger.debug("Received raw request body: %s", body)
     
-    # Parse JSON and handle JSON parsing errors
+    # Parse and validate the JSON-RPC envelope. ValidationError subclasses
+    # DecodeError, so it has to be caught first.
     try:
-        payload = json.loads(body)
-        logger.debug(f"Parsed JSON payload: {json.dumps(payload, indent=2)}")
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in request: {str(e)}")
-        return JSONResponse(
+        env = _RPC_DECODER.decode(body)
+    except msgspec.ValidationError as e:
+        logger.error("Invalid RPC request format: %s", e)
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            payload = None
+        return _error_response(
+            payload.get("id") if isinstance(payload, dict) else None,
+            InvalidRequest(f"Invalid RPC request format: {str(e)}"),
             status_code=400,
-            content={
-                "jsonrpc": "2.0",
-                "error": ParseError(f"Invalid JSON: {str(e)}").to_dict(),
-                "id": None
-            }
-        )
-    
-    # Validate against JSON-RPC envelope schema
-    try:
-        env = RPCEnvelope.model_validate(payload)
-        logger.debug(f"Validated RPC envelope: method={env.method}, id={env.id}")
-    except ValidationError as e:
-        logger.error(f"Invalid RPC request format: {str(e)}")
-        return JSONResponse(
-            status_code=400,
-            content={
-                "jsonrpc": "2.0",
-                "error": InvalidRequest(f"Invalid RPC request format: {str(e)}").to_dict(),
-                "id": payload.get("id")
-            }
         )
+    except msgspec.DecodeError as e:
+        logger.error("Invalid JSON in request: %s", e)
+        return _error_response(None, ParseError(f"Invalid JSON: {str(e)}"), status_code=400)
+    jsonrpc, method, rpc_id, params = env.jsonrpc, env.method, env.id, env.params
+    logger.debug("Validated RPC envelope: method=%s, id=%s", method, rpc_id)
     
     # Check JSON-RPC version
-    if env.jsonrpc != "2.0":
-        logger.error(f"Unsupported JSON-RPC version: {env.jsonrpc}")
-        return JSONResponse(
+    if jsonrpc != "2.0":
+        logger.error("Unsupported JSON-RPC version: %s", jsonrpc)
+        return _error_response(
+            rpc_id,
+            InvalidRequest(f"Unsupported JSON-RPC version: {jsonrpc}"),
             status_code=400,
-            content={
-                "jsonrpc": "2.0",
-                "error": InvalidRequest(f"Unsupported JSON-RPC version: {env.jsonrpc}").to_dict(),
-                "id": env.id
-            }
         )
     
-    # Configure the Trino client with the user from authentication
-    trino_client.get_client().user = trino_user
+    # Send the authenticated user to Trino for this request only
+    user_token = trino_client.CURRENT_USER.set(trino_user)
     
     # Dispatch the method call
     try:
-        logger.debug(f"Dispatching method: {env.method} with params: {env.params}")
-        result = await dispatch_rpc(env.method, env.params or {})
-        logger.debug(f"Method {env.method} returned result: {result}")
-        response = {"jsonrpc": "2.0", "id": env.id, "result": result}
-        logger.debug(f"Sending response: {json.dumps(response, indent=2)}")
+        logger.debug("Dispatching method: %s with params: %s", method, params)
+        result = await dispatch_rpc(method, params or {})
+        logger.debug("Method %s returned result: %s", method, result)
+        response = {"jsonrpc": "2.0", "id": rpc_id, "result": result}
+        logger.debug("Sending response: %s", _LazyJSON(response))
         return response
     except MCPError as exc:
         # This is already a proper MCPError, use it directly
-        logger.error(f"RPC error in method {env.method}: {exc.message}")
-        error_response = {
-            "jsonrpc": "2.0",
-            "id": env.id,
-            "error": exc.to_dict(),
-        }
-        logger.debug(f"Sending error response: {json.dumps(error_response, indent=2)}")
-        return error_response
+        logger.error("RPC error in method %s: %s", method, exc.message)
+        return _error_response(rpc_id, exc)
     except KeyError as exc:
         # Method not found
-        logger.error(f"Method not found: {env.method}")
-        error_response = {
-            "jsonrpc": "2.0",
-            "id": env.id,
-            "error": MethodNotFound(f"Method '{env.method}' not found").to_dict(),
-        }
-        logger.debug(f"Sending error response: {json.dumps(error_response, indent=2)}")
-        return error_response
+        logger.error("Method not found: %s", method)
+        return _error_response(rpc_id, MethodNotFound(f"Method '{method}' not found"))
     except Exception as exc:
         # Unexpected error
-        logger.error(f"Internal error in method {env.method}: {str(exc)}", exc_info=True)
-        error_response = {
-            "jsonrpc": "2.0",
-            "id": env.id,
-            "error": InternalError(f"Internal server error: {str(exc)}").to_dict(),
-        }
-        logger.debug(f"Sending error response: {json.dumps(error_response, indent=2)}")
-        return error_response 
\ No newline at end of file
+        logger.error("Internal error in method %s: %s", method, exc, exc_info=True)
+        return _error_response(rpc_id, InternalError(f"Internal server error: {str(exc)}"))
+    finally:
+        trino_client.CURRENT_USER.reset(user_token)
@@ -1,5 +1,13 @@
 import asyncio
-from typing import Any, Dict, List
+import contextvars
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Callable, Dict, List, Tuple, Type, TypeVar
+
+import msgspec
+from cachetools import TTLCache
+
 from . import trino_client
 from .errors import (
     InvalidParams, MethodNotFound, MCPError,
@@ -8,215 +16,253 @@ from .errors import (
 
 # Note: Trino client configuration is now handled in main.py
 
-async def list_catalogs(params: dict) -> List[str]:
+T = TypeVar("T")
+
+# Trino calls block on HTTP, so they get their own executor sized to the
+# client's connection pool rather than competing for the small default one
+_trino_executor = ThreadPoolExecutor(
+    max_workers=trino_client.POOL_MAXSIZE, thread_name_prefix="trino"
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking Trino client call on the Trino executor."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _trino_executor, functools.partial(ctx.run, func, *args)
+    )
+
+
+# Catalog/schema/table listings rarely change, so repeated lookups are served
+# from a short-lived cache keyed by (method, *args, user). Concurrent misses
+# for the same key share one in-flight Trino call.
+METADATA_CACHE_TTL_SECONDS = 15.0
+_metadata_cache: TTLCache = TTLCache(maxsize=1024, ttl=METADATA_CACHE_TTL_SECONDS)
+_metadata_inflight: Dict[tuple, "asyncio.Future[Any]"] = {}
+
+# Bumped on every invalidation, so a lookup that started before it is not cached
+_metadata_generation = 0
+
+# Statements that can change what the metadata methods return
+_DDL_PATTERN = re.compile(r"\b(?:CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+# Query IDs of DDL submitted by run_query_async that has not been seen to
+# finish. Nothing is cached while any is in flight; entries expire in case
+# the caller never checks on the query again.
+DDL_IN_FLIGHT_TTL_SECONDS = 600.0
+_ddl_in_flight: TTLCache = TTLCache(maxsize=1024, ttl=DDL_IN_FLIGHT_TTL_SECONDS)
+
+# Query states after which a statement can no longer change metadata
+_FINAL_STATES = ("FINISHED", "FAILED", "CANCELED")
+
+
+def _store_metadata(key: tuple, generation: int, task: "asyncio.Future[Any]") -> None:
+    """Cache a finished metadata lookup unless it failed or may be stale."""
+    _metadata_inflight.pop(key, None)
+    if generation != _metadata_generation or _ddl_in_flight:
+        return
+    if not task.cancelled() and task.exception() is None:
+        _metadata_cache[key] = task.result()
+
+
+async def _cached_metadata(name: str, func: Callable[..., T], *args: Any) -> T:
+    """Serve a metadata lookup from the cache, or run it once for all waiters."""
+    key = (name, *args, trino_client.CURRENT_USER.get())
+    try:
+        return _metadata_cache[key]
+    except KeyError:
+        pass
+    
+    task = _metadata_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run_blocking(func, *args))
+        _metadata_inflight[key] = task
+        task.add_done_callback(functools.partial(_store_metadata, key, _metadata_generation))
+    # Shielded so one caller going away does not cancel the shared lookup
+    return await asyncio.shield(task)
+
+
+def _clear_metadata() -> None:
+    """Drop cached metadata and keep lookups already running from caching theirs."""
+    global _metadata_generation
+    _metadata_generation += 1
+    _metadata_cache.clear()
+
+
+def _invalidate_metadata(sql: str) -> bool:
+    """Drop cached metadata when a statement may change it; True if it may."""
+    if _DDL_PATTERN.search(sql):
+        _clear_metadata()
+        return True
+    return False
+
+
+def _settle_ddl(query_id: str, state: str) -> None:
+    """Drop cached metadata once in-flight DDL reaches a final state."""
+    if state in _FINAL_STATES and _ddl_in_flight.pop(query_id, None) is not None:
+        _clear_metadata()
+
+
+# Parameter schemas, validated in one msgspec.convert call per request
+NonEmptyStr = Annotated[str, msgspec.Meta(pattern=r"\S")]
+PositiveInt = Annotated[int, msgspec.Meta(gt=0)]
+
+# Longest run_query_wait may hold a Trino executor thread
+MAX_WAIT_MS = 60_000
+
+
+class NoParams(msgspec.Struct):
+    pass
+
+
+class SqlParams(msgspec.Struct):
+    sql: NonEmptyStr
+
+
+class RunQueryParams(msgspec.Struct):
+    sql: NonEmptyStr
+    maxRows: PositiveInt = 100
+
+
+class QueryIdParams(msgspec.Struct):
+    queryId: NonEmptyStr
+
+
+class QueryResultsParams(msgspec.Struct):
+    queryId: NonEmptyStr
+    maxRows: PositiveInt = 100
+
+
+class WaitQueryParams(msgspec.Struct):
+    queryId: NonEmptyStr
+    timeoutMs: Annotated[int, msgspec.Meta(gt=0, le=MAX_WAIT_MS)] = 10_000
+    maxRows: PositiveInt = 100
+
+
+class CatalogParams(msgspec.Struct):
+    catalog: NonEmptyStr
+
+
+class SchemaParams(msgspec.Struct):
+    catalog: NonEmptyStr
+    schema: NonEmptyStr
+
+
+class TableParams(msgspec.Struct):
+    catalog: NonEmptyStr
+    schema: NonEmptyStr
+    table: NonEmptyStr
+
+
+async def list_catalogs(params: NoParams) -> List[str]:
     """Return all available Trino catalogs."""
-    # Validate parameters (though none expected for this method)
-    if params and not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary or null")
-    
-    # Run in a thread pool to avoid blocking the event loop
+    # Run on the Trino executor to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        return await asyncio.to_thread(client.list_catalogs)
+        return await _cached_metadata("list_catalogs", client.list_catalogs)
     except Exception as e:
         # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def run_query_sync(params: Dict[str, Any]) -> Dict[str, Any]:
+async def run_query_sync(params: RunQueryParams) -> Dict[str, Any]:
     """Execute a SQL statement and return up to max_rows rows."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "sql" not in params:
-        raise InvalidParams("Missing required parameter: 'sql'")
-    
-    sql = params["sql"]
-    if not isinstance(sql, str) or not sql.strip():
-        raise InvalidParams("'sql' parameter must be a non-empty string")
-    
-    # Validate optional parameters
-    max_rows = params.get("maxRows", 100)
-    if not isinstance(max_rows, int) or max_rows <= 0:
-        raise InvalidParams("'maxRows' must be a positive integer")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
+    is_ddl = _invalidate_metadata(params.sql)
     try:
-        result = await asyncio.to_thread(client.execute_query, sql, max_rows)
-        return result
+        return await run_blocking(client.execute_query, params.sql, params.maxRows)
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
+    finally:
+        # Lookups made while the statement ran may have cached the old metadata
+        if is_ddl:
+            _clear_metadata()
 
-async def run_query_async(params: Dict[str, Any]) -> Dict[str, Any]:
+async def run_query_async(params: SqlParams) -> Dict[str, Any]:
     """Execute a SQL statement asynchronously and return a query ID."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "sql" not in params:
-        raise InvalidParams("Missing required parameter: 'sql'")
-    
-    sql = params["sql"]
-    if not isinstance(sql, str) or not sql.strip():
-        raise InvalidParams("'sql' parameter must be a non-empty string")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.submit_query, sql)
+        is_ddl = _invalidate_metadata(params.sql)
+        result = await run_blocking(client.submit_query, params.sql)
+        if is_ddl:
+            _ddl_in_flight[result["queryId"]] = True
         return result
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def get_query_status(params: Dict[str, Any]) -> Dict[str, Any]:
+async def get_query_status(params: QueryIdParams) -> Dict[str, Any]:
     """Get the status of an asynchronous query."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "queryId" not in params:
-        raise InvalidParams("Missing required parameter: 'queryId'")
-    
-    query_id = params["queryId"]
-    if not isinstance(query_id, str) or not query_id.strip():
-        raise InvalidParams("'queryId' parameter must be a non-empty string")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.get_query_status, query_id)
-        return result
+        status = await run_blocking(client.get_query_status, params.queryId)
+        _settle_ddl(params.queryId, status.get("state"))
+        return status
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def get_query_results(params: Dict[str, Any]) -> Dict[str, Any]:
+async def get_query_results(params: QueryResultsParams) -> Dict[str, Any]:
     """Get results from an asynchronous query."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "queryId" not in params:
-        raise InvalidParams("Missing required parameter: 'queryId'")
-    
-    query_id = params["queryId"]
-    if not isinstance(query_id, str) or not query_id.strip():
-        raise InvalidParams("'queryId' parameter must be a non-empty string")
-    
-    # Validate optional parameters
-    max_rows = params.get("maxRows", 100)
-    if not isinstance(max_rows, int) or max_rows <= 0:
-        raise InvalidParams("'maxRows' must be a positive integer")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.get_query_results, query_id, max_rows)
+        results = await run_blocking(client.get_query_results, params.queryId, params.maxRows)
+        if results.get("nextToken") is None:
+            _settle_ddl(params.queryId, "FINISHED")
+        return results
+    except Exception as e:
+        raise handle_trino_error(e)
+
+async def run_query_wait(params: WaitQueryParams) -> Dict[str, Any]:
+    """Wait server-side for an asynchronous query, returning its first results once they are ready."""
+    client = trino_client.get_client()
+    try:
+        result = await run_blocking(
+            client.wait_for_query, params.queryId, params.timeoutMs / 1000, params.maxRows
+        )
+        _settle_ddl(params.queryId, result.get("state"))
         return result
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def list_schemas(params: Dict[str, Any]) -> List[str]:
+async def list_schemas(params: CatalogParams) -> List[str]:
     """List all schemas in a catalog."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "catalog" not in params:
-        raise InvalidParams("Missing required parameter: 'catalog'")
-    
-    catalog = params["catalog"]
-    if not isinstance(catalog, str) or not catalog.strip():
-        raise InvalidParams("'catalog' parameter must be a non-empty string")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.list_schemas, catalog)
-        return result
+        return await _cached_metadata("list_schemas", client.list_schemas, params.catalog)
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def list_tables(params: Dict[str, Any]) -> List[str]:
+async def list_tables(params: SchemaParams) -> List[str]:
     """List all tables in a schema."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "catalog" not in params:
-        raise InvalidParams("Missing required parameter: 'catalog'")
-    
-    catalog = params["catalog"]
-    if not isinstance(catalog, str) or not catalog.strip():
-        raise InvalidParams("'catalog' parameter must be a non-empty string")
-    
-    if "schema" not in params:
-        raise InvalidParams("Missing required parameter: 'schema'")
-    
-    schema = params["schema"]
-    if not isinstance(schema, str) or not schema.strip():
-        raise InvalidParams("'schema' parameter must be a non-empty string")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.list_tables, catalog, schema)
-        return result
+        return await _cached_metadata(
+            "list_tables", client.list_tables, params.catalog, params.schema
+        )
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-async def get_table_schema(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def get_table_schema(params: TableParams) -> List[Dict[str, Any]]:
     """Get the schema of a table."""
-    # Validate required parameters
-    if not isinstance(params, dict):
-        raise InvalidParams("Parameters must be a dictionary")
-    
-    if "catalog" not in params:
-        raise InvalidParams("Missing required parameter: 'catalog'")
-    
-    catalog = params["catalog"]
-    if not isinstance(catalog, str) or not catalog.strip():
-        raise InvalidParams("'catalog' parameter must be a non-empty string")
-    
-    if "schema" not in params:
-        raise InvalidParams("Missing required parameter: 'schema'")
-    
-    schema = params["schema"]
-    if not isinstance(schema, str) or not schema.strip():
-        raise InvalidParams("'schema' parameter must be a non-empty string")
-    
-    if "table" not in params:
-        raise InvalidParams("Missing required parameter: 'table'")
-    
-    table = params["table"]
-    if not isinstance(table, str) or not table.strip():
-        raise InvalidParams("'table' parameter must be a non-empty string")
-    
-    # Run in a thread pool to avoid blocking the event loop
     client = trino_client.get_client()
     try:
-        result = await asyncio.to_thread(client.get_table_schema, catalog, schema, table)
-        return result
+        return await _cached_metadata(
+            "get_table_schema", client.get_table_schema,
+            params.catalog, params.schema, params.table
+        )
     except Exception as e:
-        # Convert to appropriate MCPError
         raise handle_trino_error(e)
 
-# Map JSON‑RPC method → Python coroutine
-METHOD_TABLE = {
-    "list_catalogs": list_catalogs,
-    "run_query_sync": run_query_sync,
-    "run_query_async": run_query_async,
-    "get_query_status": get_query_status,
-    "get_query_results": get_query_results,
-    "list_schemas": list_schemas,
-    "list_tables": list_tables,
-    "get_table_schema": get_table_schema,
+# Map JSON‑RPC method → (Python coroutine, parameter schema)
+METHOD_TABLE: Dict[str, Tuple[Callable[..., Any], Type[msgspec.Struct]]] = {
+    "list_catalogs": (list_catalogs, NoParams),
+    "run_query_sync": (run_query_sync, RunQueryParams),
+    "run_query_async": (run_query_async, SqlParams),
+    "get_query_status": (get_query_status, QueryIdParams),
+    "get_query_results": (get_query_results, QueryResultsParams),
+    "run_query_wait": (run_query_wait, WaitQueryParams),
+    "list_schemas": (list_schemas, CatalogParams),
+    "list_tables": (list_tables, SchemaParams),
+    "get_table_schema": (get_table_schema, TableParams),
 }
 
 async def dispatch_rpc(method: str, params: dict):
@@ -235,8 +281,13 @@ async def dispatch_rpc(method: str, params: dict):
         InvalidParams: If the parameters are invalid
         Various MCPError subclasses: For other errors
     """
-    if method not in METHOD_TABLE:
+    entry = METHOD_TABLE.get(method)
+    if entry is None:
         raise MethodNotFound(f"Method '{method}' not found")
     
-    handler = METHOD_TABLE[method]
-    return await handler(params) 
\ No newline at end of file
+    handler, schema = entry
+    try:
+        typed_params = msgspec.convert(params, schema)
+    except msgspec.ValidationError as e:
+        raise InvalidParams(f"Invalid parameters: {e}")
+    return await handler(typed_params)
@@ -1,13 +1,20 @@
 # Trino client implementation will go here
 # This will handle communication with Trino's REST API 
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import threading
 import time
+import types
 import logging
-import re
 import base64
-from typing import Any, Dict, List, Optional, Tuple, Iterator, Set
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Iterator, Set
 from .errors import (
     handle_trino_error,
     TrinoConnectionError,
@@ -19,6 +26,158 @@ from .errors import (
 
 logger = logging.getLogger(__name__)
 
+# Trino user for the current request. Set per request instead of mutating the
+# shared client, so concurrent requests never see each other's user; when
+# unset, the client's configured user is sent.
+CURRENT_USER: ContextVar[Optional[str]] = ContextVar("trino_user", default=None)
+
+# (connect, read) timeouts in seconds for every request made to Trino
+REQUEST_TIMEOUT = (3, 30)
+
+# Upper bound on concurrent connections to Trino per client
+POOL_MAXSIZE = 64
+
+# Backoff between nextUri polls that returned nothing new, in seconds
+POLL_INTERVAL_MIN = 0.005
+POLL_INTERVAL_MAX = 0.1
+
+# Longest wait between query info reads in wait_for_query, in seconds; the
+# query info document is heavier than a statement page, so it backs off further
+WAIT_POLL_INTERVAL_MAX = 1.0
+
+# Row cap for DESCRIBE, i.e. the widest table get_table_schema reports in full
+DESCRIBE_MAX_COLUMNS = 10_000
+
+# Row cap for the catalog, schema and table listings, so large catalogs are
+# not cut off at the default max_rows
+LISTING_MAX_ROWS = 100_000
+
+# Longest single wait between retries, including server-requested ones
+MAX_BACKOFF = 10.0
+
+# Responses worth retrying; other 4xx fail the same way on every attempt
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# How long a check_connection result is reused, so bursts of health
+# probes share one SELECT 1
+CONNECTION_CHECK_TTL_SECONDS = 5.0
+
+# Query states in which a query's results can be read
+_RESULT_STATES = ("RUNNING", "FINISHED")
+# Query states after which waiting cannot help
+_FAILED_STATES = ("FAILED", "CANCELED")
+
+
+def _basic_auth_header(user: str, password: str) -> str:
+    """Build a Basic Authorization header."""
+    auth_str = f"{user}:{password}"
+    return f"Basic {base64.b64encode(auth_str.encode()).decode()}"
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a catalog, schema or table name for use in SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """Decode a Trino response body with orjson."""
+    return orjson.loads(response.content)
+
+
+# Statement page fields the client reads; stats (apart from the state),
+# warnings, infoUri and the rest are dropped as soon as a page is decoded
+_PAGE_FIELDS = ("id", "columns", "data", "nextUri", "error")
+
+
+def _parse_page(response: requests.Response) -> Dict[str, Any]:
+    """Decode a statement page, keeping only the fields the client reads."""
+    page = orjson.loads(response.content)
+    kept = {field: page[field] for field in _PAGE_FIELDS if field in page}
+    stats = page.get("stats")
+    if stats:
+        kept["state"] = stats.get("state")
+    return kept
+
+
+def _poll_delay(
+    response: requests.Response, empty_hops: int, ceiling: float = POLL_INTERVAL_MAX
+) -> float:
+    """
+    Seconds to wait before following a page that brought nothing new.
+    
+    A Retry-After on the page wins (capped at MAX_BACKOFF); otherwise the
+    wait doubles from POLL_INTERVAL_MIN up to ceiling.
+    """
+    hint = response.headers.get("Retry-After")
+    if hint:
+        try:
+            return min(max(float(hint), 0.0), MAX_BACKOFF)
+        except ValueError:
+            pass
+    return min(ceiling, POLL_INTERVAL_MIN * (2 ** empty_hops))
+
+
+# Wording for Trino error names (or types) that get their own message prefix
+_ERROR_PREFIXES = {
+    "SYNTAX_ERROR": "Syntax error",
+    "RESOURCE_ERROR": "Resource error",
+    "INSUFFICIENT_RESOURCES": "Insufficient resources",
+    "PERMISSION_DENIED": "Permission denied",
+}
+
+
+def _raise_if_error(page: Mapping[str, Any]) -> None:
+    """Raise the matching MCPError if a statement page reports a failure."""
+    error_info = page.get("error")
+    if error_info is None:
+        return
+    
+    error_message = error_info.get("message", "Unknown Trino error")
+    error_type = error_info.get("errorType", "")
+    error_name = error_info.get("errorName", "")
+    
+    if "ACCESS_DENIED" in (error_name, error_type):
+        raise TrinoAuthError(f"Access denied: {error_message}")
+    prefix = _ERROR_PREFIXES.get(error_name) or _ERROR_PREFIXES.get(error_type)
+    if prefix is None:
+        prefix = f"{error_type} {error_name}".strip()
+    raise handle_trino_error(Exception(f"{prefix}: {error_message}"))
+
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that never sleeps longer than MAX_BACKOFF, even on Retry-After."""
+    
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_BACKOFF)
+
+
+# Connection pools shared by every TrinoClient in the process, so replacing
+# or adding a client reuses warm keep-alive connections (and their TLS
+# sessions) instead of reconnecting. Creating it opens no connections.
+_shared_pool_manager = PoolManager(num_pools=32, maxsize=POOL_MAXSIZE)
+
+
+class _SharedPoolAdapter(HTTPAdapter):
+    """HTTPAdapter that draws connections from the process-wide pool manager."""
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _shared_pool_manager
+    
+    def close(self) -> None:
+        # Other clients may still be using the shared pools; only drop proxies
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
 class TrinoClient:
     def __init__(
         self,
@@ -35,6 +194,8 @@ class TrinoClient:
         verify: bool = True,
         retry_attempts: int = 3,
         retry_delay: float = 1.0,
+        query_timeout: float = 300.0,
+        target_result_size: Optional[str] = None,
     ):
         self.host = host
         self.port = port
@@ -44,44 +205,127 @@ class TrinoClient:
         self.password = password
         self.jwt_token = jwt_token
         self.session_properties = session_properties or {}
-        self.http_headers = http_headers or {}
+        self._extra_http_headers = dict(http_headers or {})
         self.http_scheme = http_scheme
         self.verify = verify
         self.base_url = f"{http_scheme}://{host}:{port}"
+        # Endpoint URLs are built once rather than on every call
+        self._url_statement = f"{self.base_url}/v1/statement"
+        self._url_query = f"{self.base_url}/v1/query/"
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
+        self.query_timeout = query_timeout
+        self.target_result_size = target_result_size
+        
+        # Last check_connection outcome and when it was taken (monotonic);
+        # zero forces the next call to probe Trino again
+        self._conn_check_at = 0.0
+        self._conn_check_ok = False
         
-        # Add default headers
-        self.http_headers.update({
-            "User-Agent": "trino-mcp-client",
-            "X-Trino-User": user,
-        })
+        # Background DELETEs for results that were cut off at max_rows
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trino-cleanup")
         
-        if catalog:
-            self.http_headers["X-Trino-Catalog"] = catalog
-        if schema:
-            self.http_headers["X-Trino-Schema"] = schema
+        # One pooled session per client so nextUri hops and concurrent
+        # queries reuse keep-alive connections instead of reconnecting
+        self._session = requests.Session()
+        retry = _CappedRetry(
+            total=max(retry_attempts - 1, 0),
+            backoff_factor=retry_delay,
+            backoff_max=MAX_BACKOFF,
+            # Jitter keeps concurrent retries from arriving in lockstep
+            backoff_jitter=retry_delay,
+            status_forcelist=RETRY_STATUS_CODES,
+            # POST submits a statement, so read and status retries could run
+            # it twice; urllib3 still retries it on connect errors, where the
+            # request never reached Trino
+            allowed_methods=frozenset({"GET", "DELETE"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _SharedPoolAdapter(max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         
-        # Add session properties if provided
-        for key, value in self.session_properties.items():
-            self.http_headers[f"X-Trino-Session"] = f"{key}={value}"
+        self._build_headers()
+    
+    def _page_url(self, next_uri: str) -> str:
+        """
+        Add the configured targetResultSize to a statement page URL.
         
-        # Add authentication headers if provided
-        self._update_auth_headers()
+        Larger pages mean fewer nextUri round trips for big results; Trino
+        caps the value at 128MB and ignores it on older coordinators.
+        """
+        if not self.target_result_size or "/v1/statement/" not in next_uri:
+            return next_uri
+        separator = "&" if "?" in next_uri else "?"
+        return f"{next_uri}{separator}targetResultSize={self.target_result_size}"
+    
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session.
+        
+        Pooled connections belong to the process-wide pool manager and stay
+        open for the other clients.
+        """
+        self._cleanup_pool.shutdown(wait=False)
+        self._session.close()
+    
+    def _abandon(self, next_uri: str) -> None:
+        """
+        Cancel the rest of a result stream in the background.
+        
+        Best effort: the caller already has its rows, so failures are only logged.
+        """
+        user = CURRENT_USER.get()
+        headers = {"X-Trino-User": user} if user is not None else None
+        try:
+            self._cleanup_pool.submit(self._delete_quietly, next_uri, headers)
+        except RuntimeError:
+            # The client is closing and the pool no longer takes work
+            pass
+    
+    def _delete_quietly(self, uri: str, headers: Optional[Mapping[str, str]]) -> None:
+        try:
+            self._session.delete(uri, headers=headers, verify=self.verify, timeout=5)
+        except requests.RequestException as e:
+            logger.debug("Could not cancel abandoned result stream %s: %s", uri, e)
 
-    def _update_auth_headers(self):
-        """Update authentication headers based on current credentials."""
+    def _build_headers(self) -> None:
+        """
+        Build the request headers from the current settings.
+        
+        The result is frozen and installed on the session once, so requests
+        never rebuild them; per-call differences go through extra_headers.
+        """
+        headers = dict(self._extra_http_headers)
+        headers["User-Agent"] = "trino-mcp-client"
+        # Every encoding urllib3 can decode here (zstd when zstandard is
+        # installed); result pages are repetitive JSON and compress well
+        headers["Accept-Encoding"] = ACCEPT_ENCODING
+        headers["X-Trino-User"] = self.user
+        
+        if self.catalog:
+            headers["X-Trino-Catalog"] = self.catalog
+        if self.schema:
+            headers["X-Trino-Schema"] = self.schema
+        
+        # Trino expects all session properties in one comma-separated header
+        if self.session_properties:
+            headers["X-Trino-Session"] = ",".join(
+                f"{key}={value}" for key, value in self.session_properties.items()
+            )
+        
         # Basic Auth
         if self.password:
-            auth_str = f"{self.user}:{self.password}"
-            auth_header = f"Basic {base64.b64encode(auth_str.encode()).decode()}"
-            self.http_headers["Authorization"] = auth_header
+            headers["Authorization"] = _basic_auth_header(self.user, self.password)
         # JWT Token
         elif self.jwt_token:
-            self.http_headers["Authorization"] = f"Bearer {self.jwt_token}"
-        # Remove auth header if no credentials
-        elif "Authorization" in self.http_headers:
-            del self.http_headers["Authorization"]
+            headers["Authorization"] = f"Bearer {self.jwt_token}"
+        
+        self.http_headers = types.MappingProxyType(headers)
+        self._session.headers = requests.structures.CaseInsensitiveDict(
+            {**requests.utils.default_headers(), **headers}
+        )
     
     def set_credentials(self, user: Optional[str] = None, password: Optional[str] = None, jwt_token: Optional[str] = None):
         """
@@ -94,139 +338,127 @@ class TrinoClient:
         """
         if user:
             self.user = user
-            self.http_headers["X-Trino-User"] = user
         
         self.password = password
         self.jwt_token = jwt_token
         
-        # Update auth headers
-        self._update_auth_headers()
-
+        # Rebuild the frozen headers with the new credentials
+        self._build_headers()
+        self._conn_check_at = 0.0
+    
     def list_catalogs(self) -> List[str]:
         """Execute SHOW CATALOGS query and return the list of available catalogs."""
-        try:
-            result = self.execute_query("SHOW CATALOGS")
-            if not result or "rows" not in result:
-                return []
-            return [row[0] for row in result["rows"]]
-        except Exception as e:
-            raise handle_trino_error(e)
+        result = self.execute_query("SHOW CATALOGS", max_rows=LISTING_MAX_ROWS)
+        if not result or "rows" not in result:
+            return []
+        return [row[0] for row in result["rows"]]
     
     def list_schemas(self, catalog: str) -> List[str]:
         """List all schemas in a catalog."""
-        try:
-            # We need to set the catalog in the headers for this query
-            original_catalog = self.http_headers.get("X-Trino-Catalog")
-            
-            # Set the catalog for this request
-            self.http_headers["X-Trino-Catalog"] = catalog
-            
-            try:
-                result = self.execute_query("SHOW SCHEMAS")
-                if not result or "rows" not in result:
-                    return []
-                return [row[0] for row in result["rows"]]
-            finally:
-                # Restore the original catalog
-                if original_catalog:
-                    self.http_headers["X-Trino-Catalog"] = original_catalog
-                else:
-                    self.http_headers.pop("X-Trino-Catalog", None)
-        except Exception as e:
-            raise handle_trino_error(e)
+        result = self.execute_query(
+            f'SELECT schema_name FROM {_quote_identifier(catalog)}.information_schema.schemata '
+            'ORDER BY schema_name',
+            max_rows=LISTING_MAX_ROWS,
+        )
+        if not result or "rows" not in result:
+            return []
+        return [row[0] for row in result["rows"]]
     
     def list_tables(self, catalog: str, schema: str) -> List[str]:
         """List all tables in a schema."""
-        try:
-            # We need to set the catalog and schema in the headers for this query
-            original_catalog = self.http_headers.get("X-Trino-Catalog")
-            original_schema = self.http_headers.get("X-Trino-Schema")
-            
-            # Set the catalog and schema for this request
-            self.http_headers["X-Trino-Catalog"] = catalog
-            self.http_headers["X-Trino-Schema"] = schema
-            
-            try:
-                result = self.execute_query("SHOW TABLES")
-                if not result or "rows" not in result:
-                    return []
-                return [row[0] for row in result["rows"]]
-            finally:
-                # Restore the original catalog and schema
-                if original_catalog:
-                    self.http_headers["X-Trino-Catalog"] = original_catalog
-                else:
-                    self.http_headers.pop("X-Trino-Catalog", None)
-                    
-                if original_schema:
-                    self.http_headers["X-Trino-Schema"] = original_schema
-                else:
-                    self.http_headers.pop("X-Trino-Schema", None)
-        except Exception as e:
-            raise handle_trino_error(e)
+        tables = self._schema_tables(catalog, schema)
+        # information_schema reports names lowercased, as SHOW TABLES resolved them
+        if not tables and schema != schema.lower():
+            tables = self._schema_tables(catalog, schema.lower())
+        return tables
+    
+    def _schema_tables(self, catalog: str, schema: str) -> List[str]:
+        """Read one schema's table names from the catalog's information_schema."""
+        result = self.execute_query(
+            f'SELECT table_name FROM {_quote_identifier(catalog)}.information_schema.tables '
+            f'WHERE table_schema = {_quote_literal(schema)} '
+            'ORDER BY table_name',
+            max_rows=LISTING_MAX_ROWS,
+        )
+        if not result or "rows" not in result:
+            return []
+        return [row[0] for row in result["rows"]]
     
     def get_table_schema(self, catalog: str, schema: str, table: str) -> List[Dict[str, Any]]:
         """Get the schema of a table."""
+        query = (
+            f"DESCRIBE {_quote_identifier(catalog)}.{_quote_identifier(schema)}"
+            f".{_quote_identifier(table)}"
+        )
+        # One row per column, so don't let the default row cap truncate wide tables
+        result = self.execute_query(query, max_rows=DESCRIBE_MAX_COLUMNS)
+        
+        if not result or "rows" not in result:
+            return []
+        
+        columns = [
+            {
+                "name": row[0],
+                "type": row[1],
+                "nullable": len(row) <= 2 or "not null" not in row[2].lower(),
+            }
+            for row in result["rows"]
+        ]
+        
+        return columns
+    
+    def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        extra_headers: Optional[Mapping[str, str]] = None,
+        **kwargs
+    ) -> requests.Response:
+        """Perform an HTTP request with retry logic.
+        
+        Retries happen inside the session's adapter (see _CappedRetry); this
+        only maps the final outcome to Trino errors. The client's headers are
+        already on the session; extra_headers are merged on top of them for
+        this request only.
+        """
+        user = CURRENT_USER.get()
+        if user is not None:
+            extra_headers = {**extra_headers, "X-Trino-User": user} if extra_headers else {"X-Trino-User": user}
+        
         try:
-            query = f'DESCRIBE "{catalog}"."{schema}"."{table}"'
-            result = self.execute_query(query)
-            
-            if not result or "rows" not in result:
-                return []
-            
-            columns = []
-            for row in result["rows"]:
-                column_name = row[0]
-                column_type = row[1]
-                is_nullable = "not null" not in row[2].lower() if len(row) > 2 else True
-                
-                columns.append({
-                    "name": column_name,
-                    "type": column_type,
-                    "nullable": is_nullable
-                })
-            
-            return columns
-        except Exception as e:
+            response = self._session.request(
+                method=method,
+                url=url,
+                headers=extra_headers,
+                verify=self.verify,
+                timeout=kwargs.pop("timeout", REQUEST_TIMEOUT),
+                **kwargs
+            )
+        except requests.RequestException as e:
+            # The adapter's retry policy has already been exhausted
+            logger.error("Request failed after %d attempts: %s", self.retry_attempts, e)
+            self._conn_check_at = 0.0
             raise handle_trino_error(e)
-    
-    def _request_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Perform an HTTP request with retry logic."""
-        last_exception = None
-        
-        for attempt in range(self.retry_attempts):
-            try:
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=self.http_headers,
-                    verify=self.verify,
-                    **kwargs
-                )
-                
-                # Check for auth-related status codes
-                if response.status_code == 401:
-                    raise TrinoAuthError("Authentication failed. Check your credentials.")
-                elif response.status_code == 403:
-                    raise TrinoAuthError("Permission denied. The user does not have sufficient privileges.")
-                
-                response.raise_for_status()
-                return response
-            except (requests.RequestException, ConnectionError) as e:
-                last_exception = e
-                if attempt < self.retry_attempts - 1:
-                    wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Request failed, retrying in {wait_time:.2f}s: {str(e)}")
-                    time.sleep(wait_time)
-        
-        # If we get here, all retries failed
-        logger.error(f"Request failed after {self.retry_attempts} attempts: {str(last_exception)}")
-        raise handle_trino_error(last_exception or RuntimeError("Request failed after multiple retries"))
+        
+        # Check for auth-related status codes
+        if response.status_code == 401:
+            self._conn_check_at = 0.0
+            raise TrinoAuthError("Authentication failed. Check your credentials.")
+        elif response.status_code == 403:
+            self._conn_check_at = 0.0
+            raise TrinoAuthError("Permission denied. The user does not have sufficient privileges.")
+        
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            logger.error("Request failed with status %d: %s", response.status_code, e)
+            raise handle_trino_error(e)
+        return response
     
     def execute_query(self, sql: str, max_rows: int = 100) -> Dict[str, Any]:
         """Execute a SQL query and return results with columns and rows."""
         # Initial request to submit the query
-        query_url = f"{self.base_url}/v1/statement"
+        query_url = self._url_statement
         
         try:
             response = self._request_with_retry(
@@ -236,10 +468,12 @@ class TrinoClient:
             )
             
             # Process response
-            query_results = response.json()
+            query_results = _parse_page(response)
             
-            # Handle nextUri for pagination until we get all results or hit max_rows
+            # Handle nextUri for pagination until we get all results or hit max_rows.
+            # Only the page that crosses the cap is sliced, never the accumulated rows.
             rows = []
+            remaining = max_rows
             columns = []
             
             if "columns" in query_results:
@@ -247,55 +481,55 @@ class TrinoClient:
             
             # Collect rows from initial response
             if "data" in query_results:
-                rows.extend(query_results["data"])
+                take = query_results["data"][:remaining]
+                rows.extend(take)
+                remaining -= len(take)
             
             # Check for error in response
-            if "error" in query_results:
-                error_info = query_results["error"]
-                error_message = error_info.get("message", "Unknown Trino error")
-                error_type = error_info.get("errorType", "")
-                error_name = error_info.get("errorName", "")
+            _raise_if_error(query_results)
+            
+            # Follow nextUri if it exists, only backing off while Trino has
+            # nothing new for us
+            deadline = time.monotonic() + self.query_timeout
+            state = query_results.get("state")
+            empty_hops = 0
+            while "nextUri" in query_results and remaining > 0:
+                if time.monotonic() > deadline:
+                    raise TrinoTimeoutError(
+                        f"Query did not finish within {self.query_timeout:g} seconds"
+                    )
                 
-                if "SYNTAX_ERROR" in error_type:
-                    raise handle_trino_error(Exception(f"Syntax error: {error_message}"))
-                elif "RESOURCE_ERROR" in error_type:
-                    raise handle_trino_error(Exception(f"Resource error: {error_message}"))
-                elif "INSUFFICIENT_RESOURCES" in error_type:
-                    raise handle_trino_error(Exception(f"Insufficient resources: {error_message}"))
-                elif "PERMISSION_DENIED" in error_type:
-                    raise handle_trino_error(Exception(f"Permission denied: {error_message}"))
-                elif "ACCESS_DENIED" in error_type:
-                    raise TrinoAuthError(f"Access denied: {error_message}")
-                else:
-                    raise handle_trino_error(Exception(f"{error_type} {error_name}: {error_message}"))
-            
-            # Follow nextUri if it exists
-            while "nextUri" in query_results and len(rows) < max_rows:
-                response = self._request_with_retry('get', query_results["nextUri"])
-                query_results = response.json()
+                response = self._request_with_retry('get', self._page_url(query_results["nextUri"]))
+                query_results = _parse_page(response)
                 
                 if "columns" in query_results and not columns:
                     columns = [col["name"] for col in query_results["columns"]]
                     
                 if "data" in query_results:
-                    rows.extend(query_results["data"])
-                    if len(rows) >= max_rows:
-                        rows = rows[:max_rows]
+                    take = query_results["data"][:remaining]
+                    rows.extend(take)
+                    remaining -= len(take)
+                    if remaining <= 0:
                         break
                 
                 # Check for error in follow-up responses too
-                if "error" in query_results:
-                    error_info = query_results["error"]
-                    error_message = error_info.get("message", "Unknown Trino error")
-                    error_type = error_info.get("errorType", "")
-                    raise handle_trino_error(Exception(f"{error_type}: {error_message}"))
+                _raise_if_error(query_results)
                 
                 # Check if query is finished
                 if "nextUri" not in query_results:
                     break
                 
-                # Add a small delay to avoid hammering the server
-                time.sleep(0.1)
+                previous_state = state
+                state = query_results.get("state")
+                if "data" in query_results or state != previous_state:
+                    empty_hops = 0
+                else:
+                    time.sleep(_poll_delay(response, empty_hops))
+                    empty_hops += 1
+            
+            # Nobody will read the rest of the result, so let Trino stop producing it
+            if remaining <= 0 and "nextUri" in query_results:
+                self._abandon(query_results["nextUri"])
             
             return {
                 "columns": columns,
@@ -303,7 +537,7 @@ class TrinoClient:
             }
             
         except Exception as e:
-            logger.error(f"Error executing query: {str(e)}")
+            logger.error("Error executing query: %s", e)
             raise handle_trino_error(e)
     
     def submit_query(self, sql: str) -> Dict[str, Any]:
@@ -313,7 +547,7 @@ class TrinoClient:
         Returns:
             Dict containing the query ID
         """
-        query_url = f"{self.base_url}/v1/statement"
+        query_url = self._url_statement
         
         try:
             response = self._request_with_retry(
@@ -323,23 +557,20 @@ class TrinoClient:
             )
             
             # Process response to get the query ID
-            query_results = response.json()
+            query_results = _parse_page(response)
             
             # Check for error in response
-            if "error" in query_results:
-                error_info = query_results["error"]
-                error_message = error_info.get("message", "Unknown Trino error")
-                error_type = error_info.get("errorType", "")
-                raise handle_trino_error(Exception(f"{error_type}: {error_message}"))
+            _raise_if_error(query_results)
             
             # Extract query ID from the response or the nextUri
             query_id = query_results.get("id")
             
             if not query_id and "nextUri" in query_results:
-                # Try to extract query ID from nextUri
-                match = re.search(r'/v1/query/([^/]+)/', query_results["nextUri"])
-                if match:
-                    query_id = match.group(1)
+                # Try to extract query ID from the segment after /v1/query/
+                _, found, tail = query_results["nextUri"].partition("/v1/query/")
+                segment, slash, _ = tail.partition("/")
+                if found and slash and segment:
+                    query_id = segment
             
             if not query_id:
                 raise TrinoQueryError("Failed to extract query ID from response")
@@ -347,9 +578,57 @@ class TrinoClient:
             return {"queryId": query_id}
             
         except Exception as e:
-            logger.error(f"Error submitting query: {str(e)}")
+            logger.error("Error submitting query: %s", e)
+            raise handle_trino_error(e)
+    
+    def wait_for_query(self, query_id: str, timeout: float, max_rows: int = 100) -> Dict[str, Any]:
+        """
+        Wait up to timeout seconds for a query's results.
+        
+        Progress is read from Trino by query ID, as get_query_status and
+        get_query_results do, so any server process can serve the wait and
+        nothing is kept between calls.
+        
+        Args:
+            query_id: The query ID to wait for
+            timeout: Seconds to wait before reporting the query as still running
+            max_rows: Maximum number of rows to return
+            
+        Returns:
+            Dict with the query's state. Once results are ready it also holds
+            columns, rows and nextToken as from get_query_results, and state is
+            Trino's state as of the last page read; further rows are read with
+            get_query_results. Without rows, the timeout expired before the
+            query had results, and waiting again is safe.
+        """
+        try:
+            deadline = time.monotonic() + timeout
+            polls = 0
+            while True:
+                response = self._request_with_retry('get', self._url_query + query_id)
+                state = _parse_json(response).get("state", "UNKNOWN")
+                if state in _RESULT_STATES or state in _FAILED_STATES:
+                    break
+                
+                delay = _poll_delay(response, polls, WAIT_POLL_INTERVAL_MAX)
+                if time.monotonic() + delay >= deadline:
+                    # No data page has been read, so calling again loses nothing
+                    return {"queryId": query_id, "state": state}
+                time.sleep(delay)
+                polls += 1
+            
+            results, state = self._collect_results(query_id, max_rows, deadline)
+            return {"queryId": query_id, "state": state, **results}
+            
+        except Exception as e:
+            logger.error("Error waiting for query: %s", e)
             raise handle_trino_error(e)
     
+    def _read_query_info(self, query_id: str) -> Dict[str, Any]:
+        """Fetch and decode a query's /v1/query/{id} document."""
+        response = self._request_with_retry('get', self._url_query + query_id)
+        return _parse_json(response)
+    
     def get_query_status(self, query_id: str) -> Dict[str, Any]:
         """
         Get the status of a query.
@@ -361,9 +640,7 @@ class TrinoClient:
             Dict containing the query state, ID, and other status information
         """
         try:
-            query_url = f"{self.base_url}/v1/query/{query_id}"
-            response = self._request_with_retry('get', query_url)
-            query_info = response.json()
+            query_info = self._read_query_info(query_id)
             
             # Transform to a more standardized format
             result = {
@@ -375,7 +652,7 @@ class TrinoClient:
             
             return result
         except Exception as e:
-            logger.error(f"Error getting query status: {str(e)}")
+            logger.error("Error getting query status: %s", e)
             raise handle_trino_error(e)
     
     def get_query_results(self, query_id: str, max_rows: int = 100) -> Dict[str, Any]:
@@ -390,98 +667,134 @@ class TrinoClient:
             Dict containing columns, rows, and a nextToken if there are more results
         """
         try:
-            # First check the query status
-            status = self.get_query_status(query_id)
-            
-            if status["state"] not in ["FINISHED", "RUNNING"]:
-                if status["state"] == "FAILED" and status["error"]:
-                    raise handle_trino_error(Exception(f"Query failed: {status['error'].get('message', 'Unknown error')}"))
-                elif status["state"] == "CANCELED":
-                    raise TrinoQueryError(f"Query was canceled")
-                else:
-                    raise TrinoQueryError(f"Query is not ready yet. Current state: {status['state']}")
-            
-            # Get results URL
-            # First try the info endpoint to get the results URL
-            query_url = f"{self.base_url}/v1/query/{query_id}"
-            response = self._request_with_retry('get', query_url)
-            query_info = response.json()
-            
-            # Figure out where to get results from
-            next_uri = None
-            
-            # If query is still running, we need to get the nextUri
-            if status["state"] == "RUNNING":
-                next_uri = query_info.get("nextUri")
-            else:  # FINISHED state
-                # For finished queries, we might have outputStage with a self link
-                output_stage = query_info.get("outputStage", {})
-                
-                if "self" in output_stage:
-                    # We can get results directly from this URL
-                    next_uri = output_stage["self"] + "/results"
-                elif "nextUri" in query_info:
-                    # Fallback to the nextUri if available
-                    next_uri = query_info["nextUri"]
-            
-            if not next_uri:
-                # If no appropriate URI is found, try constructing a URL for the first page
-                next_uri = f"{self.base_url}/v1/query/{query_id}/results"
-            
-            # Now fetch the results
-            rows = []
-            columns = []
-            next_token = None
-            
-            # Get first page of results
-            response = self._request_with_retry('get', next_uri)
-            results = response.json()
-            
-            if "columns" in results:
-                columns = [col["name"] for col in results["columns"]]
-            
-            if "data" in results:
-                rows.extend(results["data"])
-            
-            # Save nextUri as the next token if available and we need more rows
-            if "nextUri" in results and len(rows) < max_rows:
-                next_token = results["nextUri"]
-                
-                # If we need more rows and have a next token, keep fetching
-                while next_token and len(rows) < max_rows:
-                    response = self._request_with_retry('get', next_token)
-                    results = response.json()
-                    
-                    if "data" in results:
-                        rows.extend(results["data"])
-                        
-                        # Trim to max_rows
-                        if len(rows) > max_rows:
-                            rows = rows[:max_rows]
-                            break
-                    
-                    # Update next token
-                    next_token = results.get("nextUri")
-            
-            return {
-                "columns": columns,
-                "rows": rows,
-                "nextToken": next_token
-            }
-            
+            results, _ = self._collect_results(query_id, max_rows)
+            return results
         except Exception as e:
-            logger.error(f"Error getting query results: {str(e)}")
+            logger.error("Error getting query results: %s", e)
             raise handle_trino_error(e)
     
+    def _collect_results(
+        self, query_id: str, max_rows: int, deadline: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Read up to max_rows of a query's results, located through its query info.
+        
+        With a deadline (monotonic), stops following pages once it passes.
+        Returns the results and the query state reported by the last page read.
+        """
+        # One read of the query info gives both the state and where the
+        # results live
+        query_info = self._read_query_info(query_id)
+        state = query_info.get("state", "UNKNOWN")
+        
+        if state not in ["FINISHED", "RUNNING"]:
+            error = query_info.get("error")
+            if state == "FAILED" and error:
+                raise handle_trino_error(Exception(f"Query failed: {error.get('message', 'Unknown error')}"))
+            elif state == "CANCELED":
+                raise TrinoQueryError(f"Query was canceled")
+            else:
+                raise TrinoQueryError(f"Query is not ready yet. Current state: {state}")
+        
+        # Figure out where to get results from
+        next_uri = None
+        
+        # If query is still running, we need to get the nextUri
+        if state == "RUNNING":
+            next_uri = query_info.get("nextUri")
+        else:  # FINISHED state
+            # For finished queries, we might have outputStage with a self link
+            output_stage = query_info.get("outputStage", {})
+            
+            if "self" in output_stage:
+                # We can get results directly from this URL
+                next_uri = output_stage["self"] + "/results"
+            elif "nextUri" in query_info:
+                # Fallback to the nextUri if available
+                next_uri = query_info["nextUri"]
+        
+        if not next_uri:
+            # If no appropriate URI is found, try constructing a URL for the first page
+            next_uri = self._url_query + query_id + "/results"
+        
+        # Now fetch the results
+        rows = []
+        columns = []
+        next_token = None
+        
+        # Get first page of results
+        response = self._request_with_retry('get', self._page_url(next_uri))
+        results = _parse_page(response)
+        state = results.get("state") or state
+        
+        if "columns" in results:
+            columns = [col["name"] for col in results["columns"]]
+        
+        remaining = max_rows
+        if "data" in results:
+            take = results["data"][:remaining]
+            rows.extend(take)
+            remaining -= len(take)
+        
+        # Save nextUri as the next token if available and we need more rows
+        if "nextUri" in results and remaining > 0:
+            next_token = results["nextUri"]
+            
+            # If we need more rows and have a next token, keep fetching,
+            # backing off while the pages come back empty
+            empty_hops = 0
+            while next_token and remaining > 0:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if empty_hops:
+                    time.sleep(_poll_delay(response, empty_hops - 1))
+                response = self._request_with_retry('get', self._page_url(next_token))
+                results = _parse_page(response)
+                state = results.get("state") or state
+                empty_hops = 0 if "data" in results else empty_hops + 1
+                
+                if "data" in results:
+                    data = results["data"]
+                    
+                    # Trim the page that crosses max_rows
+                    if len(data) > remaining:
+                        rows.extend(data[:remaining])
+                        remaining = 0
+                        break
+                    rows.extend(data)
+                    remaining -= len(data)
+                
+                # Update next token
+                next_token = results.get("nextUri")
+        
+        return {
+            "columns": columns,
+            "rows": rows,
+            "nextToken": next_token
+        }, state
+    
     def check_connection(self) -> bool:
-        """Check if we can connect to Trino server."""
+        """
+        Check if we can connect to Trino server.
+        
+        The outcome is reused for CONNECTION_CHECK_TTL_SECONDS unless a request
+        fails to connect or authenticate in the meantime.
+        """
+        now = time.monotonic()
+        if now - self._conn_check_at < CONNECTION_CHECK_TTL_SECONDS:
+            return self._conn_check_ok
+        
         try:
             # Try a simple query that should work on any Trino instance
             self.execute_query("SELECT 1")
-            return True
+            ok = True
         except Exception as e:
-            logger.error(f"Connection check failed: {str(e)}")
-            return False
+            logger.error("Connection check failed: %s", e)
+            ok = False
+        
+        self._conn_check_ok = ok
+        self._conn_check_at = now
+        return ok
     
     def cancel_query(self, query_id: str) -> bool:
         """
@@ -494,25 +807,46 @@ class TrinoClient:
             True if the query was canceled, False otherwise
         """
         try:
-            query_url = f"{self.base_url}/v1/query/{query_id}"
+            query_url = self._url_query + query_id
             self._request_with_retry('delete', query_url)
             return True
         except Exception as e:
-            logger.error(f"Error canceling query: {str(e)}")
+            logger.error("Error canceling query: %s", e)
             return False
 
 
 # Singleton instance of the Trino client for easy import elsewhere
 default_client = None
+# Serializes creating and replacing default_client, so concurrent first calls
+# share one client (and one connection pool) instead of racing to build several
+_client_lock = threading.Lock()
 
 def get_client(**kwargs) -> TrinoClient:
     """Get a configured Trino client, creating it if needed."""
     global default_client
-    if default_client is None:
-        default_client = TrinoClient(**kwargs)
-    return default_client
+    client = default_client
+    if client is not None:
+        return client
+    with _client_lock:
+        if default_client is None:
+            default_client = TrinoClient(**kwargs)
+        return default_client
 
 def configure_client(**kwargs) -> None:
     """Configure the default client with the given parameters."""
     global default_client
-    default_client = TrinoClient(**kwargs) 
\ No newline at end of file
+    with _client_lock:
+        # Stop the previous client's background work; its connections stay
+        # pooled for the replacement
+        if default_client is not None:
+            default_client.close()
+        default_client = TrinoClient(**kwargs)
+
+def close_client() -> None:
+    """Close and drop the default client and release all pooled connections."""
+    global default_client
+    with _client_lock:
+        if default_client is not None:
+            default_client.close()
+            default_client = None
+        _shared_pool_manager.clear()
@@ -9,24 +9,285 @@ This module handles:
 The generated data follows patterns that make it suitable for fraud rule analysis.
 """
 
-import random
+import csv
+import io
+import queue
 import datetime
-from faker import Faker
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 import numpy as np
-from tqdm import tqdm
+from psycopg2.extras import execute_values
 
-from .db_setup import get_postgres_connection, get_clickhouse_client
-
-# Initialize faker
-fake = Faker()
+from .db_setup import get_postgres_connection, get_clickhouse_client, create_postgres_indexes
+from .schema_definitions import COUNTRIES
 
 # Constants
 DEFAULT_NUM_USERS = 5000
 DEFAULT_NUM_RECORDS = 50000
-COUNTRIES = ['US', 'CA', 'UK', 'FR', 'DE', 'NG', 'ZA', 'IN', 'CN', 'JP', 'AU', 'BR', 'MX']
 HIGH_RISK_COUNTRIES = ['NG', 'ZA', 'IN']
 FRAUD_RATE = 0.05
 
+# Countries are generated and stored as their code, i.e. their index in
+# COUNTRIES (see the country_codes table)
+HIGH_RISK_IDX = np.array([COUNTRIES.index(code) for code in HIGH_RISK_COUNTRIES], dtype=np.uint8)
+IS_HIGH_RISK_IDX = np.isin(COUNTRIES, HIGH_RISK_COUNTRIES)
+
+# Fraud probability multipliers, in risk-flag bit order:
+# high-risk user, new account with amount > 300, high-risk country with
+# amount > 200, country mismatch with amount > 250, more than 10 tx in 24h
+FRAUD_RISK_MULTIPLIERS = np.array([3, 2, 2.5, 3, 2])
+# Fraud probability for each combination of risk flags, capped at 0.9 to
+# avoid deterministic outcomes
+_FLAG_BITS = (np.arange(32)[:, None] >> np.arange(len(FRAUD_RISK_MULTIPLIERS))) & 1
+FRAUD_PROB_BY_FLAGS = np.minimum(
+    FRAUD_RATE * np.where(_FLAG_BITS, FRAUD_RISK_MULTIPLIERS, 1.0).prod(axis=1), 0.9
+)
+
+# payments columns written by the generator (order_id is assigned by PostgreSQL)
+PAYMENT_COLUMNS = ('user_id', 'amount', 'country', 'shipping_country', 'ts', 'authorized', 'fraud_label')
+COPY_PAYMENTS_SQL = f"COPY payments ({', '.join(PAYMENT_COLUMNS)}) FROM STDIN WITH (FORMAT BINARY)"
+COPY_PAYMENTS_CSV_SQL = f"COPY payments ({', '.join(PAYMENT_COLUMNS)}) FROM STDIN WITH (FORMAT CSV)"
+# Binary COPY framing: signature, flags and header extension length, and the
+# end-of-data marker
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + bytes(8)
+PGCOPY_TRAILER = b'\xff\xff'
+# One binary COPY tuple: the field count, then each field's byte length and
+# big-endian value. amount is a NUMERIC of three base-10000 digits (two whole,
+# one for the cents), and ts counts microseconds from 2000-01-01.
+PGCOPY_ROW = np.dtype([
+    ('nfields', '>i2'),
+    ('user_id_len', '>i4'), ('user_id', '>i4'),
+    ('amount_len', '>i4'), ('amount_ndigits', '>i2'), ('amount_weight', '>i2'),
+    ('amount_sign', '>u2'), ('amount_dscale', '>i2'), ('amount_digits', '>i2', (3,)),
+    ('country_len', '>i4'), ('country', '>i2'),
+    ('shipping_country_len', '>i4'), ('shipping_country', '>i2'),
+    ('ts_len', '>i4'), ('ts', '>i8'),
+    ('authorized_len', '>i4'), ('authorized', 'u1'),
+    ('fraud_label_len', '>i4'), ('fraud_label', '>i4'),
+])
+PGCOPY_FIELD_LENGTHS = {
+    'user_id': 4, 'amount': 14, 'country': 2, 'shipping_country': 2,
+    'ts': 8, 'authorized': 1, 'fraud_label': 4
+}
+PG_EPOCH = np.datetime64('2000-01-01', 'us')
+NUMERIC_NEG = 0x4000
+# The load is one regeneratable transaction, so its commit need not wait for
+# the WAL flush (SET LOCAL only lasts until that commit)
+RELAX_DURABILITY_SQL = "SET LOCAL synchronous_commit = OFF"
+# Rows per multi-row INSERT statement when COPY is not used
+INSERT_PAGE_SIZE = 1000
+# Payments generated and encoded per chunk when streaming into COPY
+STREAM_CHUNK_SIZE = 10_000
+# Encoded chunks that may wait for the COPY thread before generation pauses
+STREAM_QUEUE_SIZE = 4
+
+def _payment_window():
+    """
+    Return the time window payments are spread over.
+    
+    Returns:
+        tuple: (end_date, date_range) - now, and the number of days before it
+    """
+    # Set a fixed date range ending today and going back 120 days
+    end_date = datetime.datetime.now()
+    start_date = end_date - datetime.timedelta(days=120)
+    return end_date, (end_date - start_date).days
+
+def _encode_payments_binary(payments):
+    """
+    Encode payment columns as binary COPY tuples.
+    
+    Every column is written with vectorized casts into one PGCOPY_ROW
+    record array, so the server stores the values without parsing any text.
+    
+    Args:
+        payments (dict): Payment columns keyed by PAYMENT_COLUMNS
+    
+    Returns:
+        bytes: One tuple per payment, without the header and trailer
+    """
+    rows = np.empty(len(payments['user_id']), dtype=PGCOPY_ROW)
+    rows['nfields'] = len(PAYMENT_COLUMNS)
+    for name, length in PGCOPY_FIELD_LENGTHS.items():
+        rows[f'{name}_len'] = length
+    
+    rows['user_id'] = payments['user_id']
+    
+    # DECIMAL(10,2) as base-10000 digits; PostgreSQL strips the leading zero digits
+    amount = payments['amount']
+    whole, cents = np.divmod(np.rint(np.abs(amount) * 100).astype(np.int64), 100)
+    rows['amount_ndigits'] = 3
+    rows['amount_weight'] = 1
+    rows['amount_sign'] = np.where(amount < 0, NUMERIC_NEG, 0)
+    rows['amount_dscale'] = 2
+    rows['amount_digits'][:, 0] = whole // 10000
+    rows['amount_digits'][:, 1] = whole % 10000
+    rows['amount_digits'][:, 2] = cents * 100
+    
+    rows['country'] = payments['country']
+    rows['shipping_country'] = payments['shipping_country']
+    rows['ts'] = (payments['ts'] - PG_EPOCH).astype(np.int64)
+    rows['authorized'] = payments['authorized']
+    rows['fraud_label'] = payments['fraud_label']
+    return rows.tobytes()
+
+def _encode_payments_csv(payments):
+    """
+    Encode payment columns as CSV text for COPY FROM STDIN.
+    
+    Args:
+        payments (dict): Payment columns keyed by PAYMENT_COLUMNS
+    
+    Returns:
+        bytes: One CSV line per payment
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerows(zip(
+        payments['user_id'].tolist(),
+        payments['amount'].tolist(),
+        payments['country'].tolist(),
+        payments['shipping_country'].tolist(),
+        # ISO strings straight from datetime64, without a datetime object per row
+        np.datetime_as_string(payments['ts'], unit='us').tolist(),
+        np.where(payments['authorized'], 't', 'f').tolist(),
+        payments['fraud_label'].tolist()
+    ))
+    return buf.getvalue().encode()
+
+def _copy_encoding(binary):
+    """
+    Return how payments are written for the chosen COPY format.
+    
+    Args:
+        binary (bool): Use binary COPY; if False, fall back to CSV
+    
+    Returns:
+        tuple: (COPY statement, header bytes, chunk encoder, trailer bytes)
+    """
+    if binary:
+        return COPY_PAYMENTS_SQL, PGCOPY_HEADER, _encode_payments_binary, PGCOPY_TRAILER
+    return COPY_PAYMENTS_CSV_SQL, b'', _encode_payments_csv, b''
+
+class _CopyStream:
+    """
+    File-like source for copy_expert fed by a queue of encoded chunks.
+    
+    A None chunk ends the stream; an exception chunk is raised from read(),
+    which makes psycopg2 abort the COPY instead of committing partial data.
+    """
+    
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._current = io.BytesIO()
+        self.done = False
+    
+    def read(self, size=-1):
+        data = self._current.read(size)
+        while not data and not self.done:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self.done = True
+            elif isinstance(chunk, BaseException):
+                self.done = True
+                raise chunk
+            else:
+                self._current = io.BytesIO(chunk)
+                data = self._current.read(size)
+        return data
+    
+    def drain(self):
+        """Discard chunks until the end of the stream so the producer never blocks."""
+        while not self.done:
+            chunk = self._chunks.get()
+            self.done = chunk is None or isinstance(chunk, BaseException)
+
+def _payments_like(shard, n):
+    """Preallocate n-record payment columns with the same dtypes as shard."""
+    return {name: np.empty(n, dtype=shard[name].dtype) for name in PAYMENT_COLUMNS}
+
+
+def _generate_shard(users, n, seed, end_date, date_range):
+    """
+    Generate n payment records for the given users.
+    
+    Every random draw is made once for all records; the per-record rules
+    become array expressions instead of a Python loop. Module-level so
+    ProcessPoolExecutor workers can run it.
+    
+    Args:
+        users (dict): User columns as produced by generate_user_data
+        n (int): Number of payment records to generate
+        seed: Seed (or SeedSequence) for this shard's random generator
+        end_date (datetime.datetime): Latest possible transaction time
+        date_range (int): Days before end_date that transactions span
+    
+    Returns:
+        dict: Column name -> NumPy array of payment data, keyed by PAYMENT_COLUMNS
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Select a user per record
+    user_idx = rng.integers(0, len(users['user_id']), n)
+    is_high_risk = users['is_high_risk'][user_idx]
+    is_new_account = users['first_seen_days'][user_idx] < 30
+    tx_last_24h = users['tx_last_24h'][user_idx]
+    
+    # Transaction timestamps, as minute offsets back from end_date
+    offset_minutes = (
+        rng.integers(0, date_range + 1, n) * 1440
+        + rng.integers(0, 24, n) * 60
+        + rng.integers(0, 60, n)
+    )
+    ts = np.datetime64(end_date, 'us') - offset_minutes.astype('timedelta64[m]')
+    
+    # High-risk users mostly transact from high-risk countries
+    country_idx = np.where(
+        is_high_risk & (rng.random(n) < 0.7),
+        HIGH_RISK_IDX[rng.integers(0, len(HIGH_RISK_IDX), n)],
+        rng.integers(0, len(COUNTRIES), n, dtype=np.uint8)
+    )
+    
+    # Shipping country usually matches but sometimes doesn't
+    country_mismatch = rng.random(n) < 0.15
+    shipping_idx = np.where(
+        country_mismatch, rng.integers(0, len(COUNTRIES), n, dtype=np.uint8), country_idx
+    )
+    
+    # 10% high-value transactions, uniform on 500-2000, the rest uniform on
+    # 10-500; one uniform draw is scaled into whichever range applies
+    high_value = rng.random(n) < 0.1
+    amount = rng.random(n)
+    amount *= np.where(high_value, 1500.0, 490.0)
+    amount += np.where(high_value, 500.0, 10.0)
+    np.round(amount, 2, out=amount)
+    
+    # Determine fraud label based on risk factors: each record's rule flags
+    # form a 5-bit code, and the code picks its precomputed probability
+    risk_flags = is_high_risk.view(np.uint8).copy()
+    risk_flags |= (is_new_account & (amount > 300)).view(np.uint8) << 1
+    risk_flags |= (IS_HIGH_RISK_IDX[country_idx] & (amount > 200)).view(np.uint8) << 2
+    risk_flags |= (country_mismatch & (amount > 250)).view(np.uint8) << 3
+    risk_flags |= (tx_last_24h > 10).view(np.uint8) << 4
+    fraud_prob = FRAUD_PROB_BY_FLAGS[risk_flags]
+    
+    fraud_label = (rng.random(n) < fraud_prob).astype(np.int8)
+    
+    # Authentication is usually successful unless fraud
+    authorized = rng.random(n) > np.where(fraud_label == 1, 0.9, 0.02)
+    
+    return {
+        'user_id': users['user_id'][user_idx],
+        'amount': amount,
+        'country': country_idx,
+        'shipping_country': shipping_idx,
+        'ts': ts,
+        'authorized': authorized,
+        'fraud_label': fraud_label
+    }
+
+
 class FraudDataGenerator:
     """
     Generator for synthetic fraud detection data.
@@ -36,18 +297,86 @@ class FraudDataGenerator:
     - Payment transaction data with fraud signals for PostgreSQL
     """
     
-    def __init__(self, num_users=DEFAULT_NUM_USERS, num_records=DEFAULT_NUM_RECORDS):
+    def __init__(self, num_users=DEFAULT_NUM_USERS, num_records=DEFAULT_NUM_RECORDS, workers=1,
+                 postgres_config=None, clickhouse_config=None, seed=None):
         """
         Initialize the data generator.
         
         Args:
             num_users (int): Number of unique users to generate
             num_records (int): Number of payment records to generate
+            workers (int): Processes to split payment generation across
+            postgres_config (dict): Default PostgreSQL connection configuration
+            clickhouse_config (dict): Default ClickHouse connection configuration
+            seed (int): Seed for reproducible data (for a given worker count);
+                fresh entropy when None
         """
         self.num_users = num_users
         self.num_records = num_records
-        self.users = []
-        self.payments = []
+        self.workers = workers
+        self.postgres_config = postgres_config
+        self.clickhouse_config = clickhouse_config
+        # Every user and payment shard draws from its own child of this seed
+        self._seed_seq = np.random.SeedSequence(seed)
+        # Column name -> NumPy array, one entry per user / payment
+        self.users = {}
+        self.payments = {}
+        # Connections opened on first use and reused until close()
+        self._pg_conn = None
+        self._pg_conn_config = None
+        self._ch_client = None
+        self._ch_client_config = None
+    
+    def _postgres_connection(self, postgres_config=None):
+        """
+        Return the generator's PostgreSQL connection, opening it on first use.
+        
+        Args:
+            postgres_config (dict): Connection configuration; defaults to the one
+                given to the constructor. A different configuration replaces
+                the cached connection.
+        
+        Returns:
+            connection: psycopg2 connection
+        """
+        config = postgres_config or self.postgres_config
+        conn = self._pg_conn
+        if conn is None or conn.closed or config != self._pg_conn_config:
+            if conn is not None:
+                conn.close()
+            conn, cursor = get_postgres_connection(config)
+            cursor.close()
+            self._pg_conn, self._pg_conn_config = conn, config
+        return conn
+    
+    def _clickhouse_client(self, clickhouse_config=None):
+        """
+        Return the generator's ClickHouse client, creating it on first use.
+        
+        Args:
+            clickhouse_config (dict): Connection configuration; defaults to the one
+                given to the constructor. A different configuration replaces
+                the cached client.
+        
+        Returns:
+            clickhouse_driver.Client: ClickHouse client
+        """
+        config = clickhouse_config or self.clickhouse_config
+        if self._ch_client is None or config != self._ch_client_config:
+            if self._ch_client is not None:
+                self._ch_client.disconnect()
+            self._ch_client = get_clickhouse_client(config)
+            self._ch_client_config = config
+        return self._ch_client
+    
+    def close(self):
+        """Close the PostgreSQL connection and ClickHouse client, if open."""
+        if self._pg_conn is not None:
+            self._pg_conn.close()
+            self._pg_conn = None
+        if self._ch_client is not None:
+            self._ch_client.disconnect()
+            self._ch_client = None
     
     def generate_user_data(self):
         """
@@ -61,30 +390,33 @@ class FraudDataGenerator:
         Also adds a 'is_high_risk' flag for internal use during payment generation.
         
         Returns:
-            list: List of user data dictionaries
+            dict: Column name -> NumPy array of user data
         """
-        self.users = []
+        n = self.num_users
+        rng = np.random.default_rng(self._seed_seq.spawn(1)[0])
+        user_id = np.arange(1, n + 1, dtype=np.uint32)
         
-        # Create base user profiles
-        for i in range(1, self.num_users + 1):
-            # Determine if user account is new (1-30 days) or established
-            is_new_account = random.random() < 0.3
-            first_seen_days = random.randint(1, 30) if is_new_account else random.randint(31, 730)
-            
-            # Transaction velocity - newer accounts tend to have lower velocity
-            if is_new_account:
-                tx_last_24h = max(1, int(np.random.exponential(2)))
-            else:
-                tx_last_24h = max(1, int(np.random.exponential(5)))
-            
-            self.users.append({
-                'user_id': i,
-                'tx_last_24h': tx_last_24h,
-                'first_seen_days': first_seen_days,
-                'is_high_risk': random.random() < 0.2  # 20% of users flagged as high risk
-            })
-        
-        print(f"Generated data for {len(self.users)} users.")
+        # Determine if user account is new (1-30 days) or established
+        is_new_account = rng.random(n) < 0.3
+        first_seen = np.where(
+            is_new_account, rng.integers(1, 31, n), rng.integers(31, 731, n)
+        ).astype(np.uint16)
+        
+        # Transaction velocity - newer accounts tend to have lower velocity,
+        # so the exponential's scale is picked per user before a single draw
+        scale = np.where(is_new_account, 2.0, 5.0)
+        tx_last_24h = np.maximum(1, rng.exponential(scale).astype(np.uint16))
+        
+        is_high_risk = rng.random(n) < 0.2  # 20% of users flagged as high risk
+        
+        self.users = {
+            'user_id': user_id,
+            'tx_last_24h': tx_last_24h,
+            'first_seen_days': first_seen,
+            'is_high_risk': is_high_risk
+        }
+        
+        print(f"Generated data for {n} users.")
         return self.users
     
     def generate_payment_data(self):
@@ -99,95 +431,75 @@ class FraudDataGenerator:
         - Higher fraud rates for users with many transactions in 24h
         
         Returns:
-            list: List of payment data dictionaries
+            dict: Column name -> NumPy array of payment data, keyed by PAYMENT_COLUMNS
         """
         if not self.users:
             self.generate_user_data()
         
-        self.payments = []
+        n = self.num_records
+        end_date, date_range = _payment_window()
         
-        # Set a fixed date range ending today and going back 120 days
-        end_date = datetime.datetime.now()
-        start_date = end_date - datetime.timedelta(days=120)
-        date_range = (end_date - start_date).days
+        print(f"Generating {n} payment records...")
         
-        for i in tqdm(range(self.num_records), desc="Generating payment records"):
-            # Select a user
-            user = random.choice(self.users)
-            user_id = user['user_id']
-            is_high_risk = user['is_high_risk']
-            is_new_account = user['first_seen_days'] < 30
-            
-            # Generate transaction timestamp
-            days_ago = random.randint(0, date_range)
-            hours_ago = random.randint(0, 23)
-            minutes_ago = random.randint(0, 59)
-            ts = end_date - datetime.timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)
-            
-            # Generate countries
-            country = random.choice(HIGH_RISK_COUNTRIES) if is_high_risk and random.random() < 0.7 else random.choice(COUNTRIES)
-            
-            # Shipping country usually matches but sometimes doesn't
-            country_mismatch = random.random() < 0.15
-            shipping_country = random.choice(COUNTRIES) if country_mismatch else country
-            
-            # Generate transaction amount (log-normal distribution)
-            # Fraud transactions tend to be larger
-            if random.random() < 0.1:  # 10% high-value transactions
-                amount = round(random.uniform(500, 2000), 2)
-            else:
-                amount = round(random.uniform(10, 500), 2)
-            
-            # Determine fraud label based on risk factors
-            # Implement various fraud patterns:
-            
-            # Base fraud probability
-            fraud_prob = FRAUD_RATE
-            
-            # Increase for high-risk factors
-            if is_high_risk:
-                fraud_prob *= 3
-            
-            if is_new_account and amount > 300:
-                fraud_prob *= 2
-                
-            if country in HIGH_RISK_COUNTRIES and amount > 200:
-                fraud_prob *= 2.5
-                
-            if country_mismatch and amount > 250:
-                fraud_prob *= 3
-                
-            if user['tx_last_24h'] > 10:
-                fraud_prob *= 2
-                
-            # Cap probability at 0.9 to avoid deterministic outcomes
-            fraud_prob = min(fraud_prob, 0.9)
-            
-            # Determine fraud label
-            fraud_label = 1 if random.random() < fraud_prob else 0
-            
-            # Authentication is usually successful unless fraud
-            authorized = random.random() > (0.9 if fraud_label else 0.02)
-            
-            self.payments.append({
-                'user_id': user_id,
-                'amount': amount,
-                'country': country,
-                'shipping_country': shipping_country,
-                'ts': ts,
-                'authorized': authorized,
-                'fraud_label': fraud_label
-            })
-        
-        print(f"Generated {len(self.payments)} payment records.")
+        if self.workers > 1 and n >= self.workers:
+            # Independent shards with their own child seeds, one per worker
+            base, extra = divmod(n, self.workers)
+            sizes = [base + (shard < extra) for shard in range(self.workers)]
+            seeds = self._seed_seq.spawn(self.workers)
+            payments = None
+            offset = 0
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for shard in executor.map(
+                    _generate_shard, repeat(self.users), sizes, seeds,
+                    repeat(end_date), repeat(date_range)
+                ):
+                    # Copy each shard into place as it arrives
+                    if payments is None:
+                        payments = _payments_like(shard, n)
+                    end = offset + len(shard['user_id'])
+                    for name in PAYMENT_COLUMNS:
+                        payments[name][offset:end] = shard[name]
+                    offset = end
+            self.payments = payments
+        else:
+            seed = self._seed_seq.spawn(1)[0]
+            self.payments = _generate_shard(self.users, n, seed, end_date, date_range)
+        
+        print(f"Generated {n} payment records.")
         return self.payments
     
-    def insert_postgres_data(self, postgres_config):
+    def _payments_copy_data(self, binary=True):
+        """
+        Encode the payment data for COPY FROM STDIN.
+        
+        Args:
+            binary (bool): Encode for binary COPY; if False, as CSV
+        
+        Returns:
+            io.BytesIO: Buffer holding the complete COPY data, rewound to the start
+        """
+        _, header, encode, trailer = _copy_encoding(binary)
+        return io.BytesIO(header + encode(self.payments) + trailer)
+    
+    def payment_records(self):
         """
-        Insert payment data into PostgreSQL.
+        Return the payment data as a list of row dictionaries.
+        
+        Returns:
+            list: One dict per payment, keyed by PAYMENT_COLUMNS, with native Python values
+        """
+        columns = [self.payments[name].tolist() for name in PAYMENT_COLUMNS]
+        return [dict(zip(PAYMENT_COLUMNS, row)) for row in zip(*columns)]
+    
+    def insert_postgres_data(self, postgres_config=None, use_copy=True, binary=True):
+        """
+        Insert payment data into PostgreSQL, then build the payments indexes.
         
         Args:
             postgres_config (dict): PostgreSQL connection configuration
+            use_copy (bool): Stream all rows with a single COPY FROM STDIN;
+                if False, fall back to batched INSERT statements
+            binary (bool): Use binary COPY; if False, fall back to CSV
         
         Returns:
             bool: True if insertion was successful, False otherwise
@@ -195,46 +507,54 @@ class FraudDataGenerator:
         if not self.payments:
             self.generate_payment_data()
         
+        conn = None
         try:
-            conn, cursor = get_postgres_connection(postgres_config)
-            
-            # Insert data in batches
-            batch_size = 1000
-            for i in tqdm(range(0, len(self.payments), batch_size), desc="Inserting into PostgreSQL"):
-                batch = self.payments[i:i+batch_size]
-                
-                args = []
-                for payment in batch:
-                    args.append((
-                        payment['user_id'],
-                        payment['amount'],
-                        payment['country'],
-                        payment['shipping_country'],
-                        payment['ts'],
-                        payment['authorized'],
-                        payment['fraud_label']
-                    ))
+            conn = self._postgres_connection(postgres_config)
+            with conn.cursor() as cursor:
+                cursor.execute(RELAX_DURABILITY_SQL)
                 
-                cursor.executemany(
-                    """
-                    INSERT INTO payments 
-                    (user_id, amount, country, shipping_country, ts, authorized, fraud_label) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, 
-                    args
-                )
-                conn.commit()
+                if use_copy:
+                    # One COPY in one transaction: no per-row statement parsing or round trips
+                    print("Copying payment records into PostgreSQL...")
+                    copy_sql = _copy_encoding(binary)[0]
+                    cursor.copy_expert(copy_sql, self._payments_copy_data(binary))
+                    conn.commit()
+                else:
+                    self._insert_postgres_batches(conn, cursor)
             
-            cursor.close()
-            conn.close()
-            print(f"Inserted {len(self.payments)} records into PostgreSQL.")
-            return True
+            print(f"Inserted {len(self.payments['user_id'])} records into PostgreSQL.")
+            # Indexes are built in one pass over the loaded table
+            return create_postgres_indexes(postgres_config, conn=conn)
         
         except Exception as e:
+            # Leave the reused connection usable for the next call
+            if conn is not None and not conn.closed:
+                conn.rollback()
             print(f"Error inserting into PostgreSQL: {e}")
             return False
     
-    def insert_clickhouse_data(self, clickhouse_config):
+    def _insert_postgres_batches(self, conn, cursor):
+        """
+        Insert payment data with multi-row INSERT statements.
+        
+        Slower than COPY, but goes through regular INSERTs (e.g. for rules or
+        triggers that don't fire on COPY). execute_values sends each page of
+        rows as one INSERT ... VALUES (...), (...) statement.
+        """
+        # tolist() yields native ints, floats, strs, bools and datetimes for psycopg2
+        args = list(zip(*(self.payments[name].tolist() for name in PAYMENT_COLUMNS)))
+        
+        print("Inserting payment records into PostgreSQL...")
+        execute_values(
+            cursor,
+            f"INSERT INTO payments ({', '.join(PAYMENT_COLUMNS)}) VALUES %s",
+            args,
+            page_size=INSERT_PAGE_SIZE
+        )
+        # A single commit at the end rather than one per batch
+        conn.commit()
+    
+    def insert_clickhouse_data(self, clickhouse_config=None):
         """
         Insert user velocity data into ClickHouse.
         
@@ -248,49 +568,153 @@ class FraudDataGenerator:
             self.generate_user_data()
         
         try:
-            client = get_clickhouse_client(clickhouse_config)
+            client = self._clickhouse_client(clickhouse_config)
             
-            # Prepare data for insertion
+            # One list per column, matching the table's column order
             user_data = [
-                (
-                    user['user_id'],
-                    user['tx_last_24h'],
-                    user['first_seen_days']
-                )
-                for user in self.users
+                self.users['user_id'].tolist(),
+                self.users['tx_last_24h'].tolist(),
+                self.users['first_seen_days'].tolist()
             ]
             
-            # Insert all data at once (ClickHouse is optimized for bulk inserts)
+            # Insert all data at once, column by column, as the native protocol
+            # sends it (no row-to-column transpose in the driver)
             client.execute(
                 "INSERT INTO user_velocity VALUES", 
-                user_data
+                user_data,
+                columnar=True
             )
             
-            print(f"Inserted {len(self.users)} records into ClickHouse.")
+            print(f"Inserted {len(self.users['user_id'])} records into ClickHouse.")
             return True
         
         except Exception as e:
             print(f"Error inserting into ClickHouse: {e}")
             return False
             
-    def generate_and_insert_data(self, postgres_config, clickhouse_config):
+    def _payment_chunks(self):
+        """
+        Generate the payment data in chunks of STREAM_CHUNK_SIZE records.
+        
+        Chunks are generated in worker processes when workers > 1.
+        
+        Yields:
+            dict: Payment columns for the next chunk, in order
+        """
+        n = self.num_records
+        end_date, date_range = _payment_window()
+        sizes = [min(STREAM_CHUNK_SIZE, n - start) for start in range(0, max(n, 1), STREAM_CHUNK_SIZE)]
+        seeds = self._seed_seq.spawn(len(sizes))
+        args = (repeat(self.users), sizes, seeds, repeat(end_date), repeat(date_range))
+        
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                yield from executor.map(_generate_shard, *args)
+        else:
+            yield from map(_generate_shard, *args)
+    
+    def stream_postgres_data(self, postgres_config=None, binary=True):
+        """
+        Generate payment data while it is being copied into PostgreSQL.
+        
+        Chunks are encoded here and handed to a thread running a single
+        COPY FROM STDIN, so generation overlaps with the load instead of
+        finishing before it starts. The generated columns end up in
+        self.payments as with generate_payment_data. The payments indexes
+        are built once the load finishes.
+        
+        Args:
+            postgres_config (dict): PostgreSQL connection configuration
+            binary (bool): Use binary COPY; if False, fall back to CSV
+        
+        Returns:
+            bool: True if insertion was successful, False otherwise
+        """
+        if not self.users:
+            self.generate_user_data()
+        
+        copy_sql, header, encode, trailer = _copy_encoding(binary)
+        chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stream = _CopyStream(chunks)
+        errors = []
+        
+        def copy_payments():
+            conn = None
+            try:
+                conn = self._postgres_connection(postgres_config)
+                with conn.cursor() as cursor:
+                    cursor.execute(RELAX_DURABILITY_SQL)
+                    cursor.copy_expert(copy_sql, stream)
+                conn.commit()
+            except Exception as e:
+                if conn is not None and not conn.closed:
+                    conn.rollback()
+                errors.append(e)
+            finally:
+                stream.drain()
+        
+        copier = threading.Thread(target=copy_payments, name="payments-copy")
+        copier.start()
+        
+        print(f"Generating and copying {self.num_records} payment records into PostgreSQL...")
+        payments = None
+        offset = 0
+        try:
+            chunks.put(header)
+            for shard in self._payment_chunks():
+                if errors:
+                    # The COPY already failed; nothing more will be loaded
+                    break
+                if payments is None:
+                    payments = _payments_like(shard, self.num_records)
+                end = offset + len(shard['user_id'])
+                for name in PAYMENT_COLUMNS:
+                    payments[name][offset:end] = shard[name]
+                offset = end
+                chunks.put(encode(shard))
+        except Exception as e:
+            chunks.put(e)
+            copier.join()
+            print(f"Error generating payment data: {e}")
+            return False
+        chunks.put(trailer)
+        chunks.put(None)
+        copier.join()
+        
+        if errors:
+            print(f"Error inserting into PostgreSQL: {errors[0]}")
+            return False
+        
+        self.payments = payments
+        print(f"Generated {self.num_records} payment records.")
+        print(f"Inserted {self.num_records} records into PostgreSQL.")
+        # Indexes are built in one pass over the loaded table
+        return create_postgres_indexes(
+            postgres_config, conn=self._postgres_connection(postgres_config)
+        )
+    
+    def generate_and_insert_data(self, postgres_config=None, clickhouse_config=None):
         """
         Generate and insert data into both PostgreSQL and ClickHouse.
         
         Args:
             postgres_config (dict): PostgreSQL connection configuration
+                (defaults to the one given to the constructor)
             clickhouse_config (dict): ClickHouse connection configuration
+                (defaults to the one given to the constructor)
         
         Returns:
             tuple: (postgres_success, clickhouse_success)
         """
         # Generate data
         self.generate_user_data()
-        self.generate_payment_data()
         
-        # Insert data
-        pg_success = self.insert_postgres_data(postgres_config)
-        ch_success = self.insert_clickhouse_data(clickhouse_config)
+        # The small user table loads into ClickHouse while payments are
+        # generated and streamed into PostgreSQL
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ch_future = executor.submit(self.insert_clickhouse_data, clickhouse_config)
+            pg_success = self.stream_postgres_data(postgres_config)
+            ch_success = ch_future.result()
         
         if pg_success and ch_success:
             print("Data generation and insertion completed successfully for all databases.")
@@ -3,7 +3,7 @@ Database setup module for the Fraud Rule Copilot project.
 
 This module handles:
 1. Creating necessary tables in PostgreSQL and ClickHouse
-2. Setting up any required indexes or optimizations
+2. Creating the PostgreSQL indexes once data has been loaded
 3. Helper functions for connecting to both databases
 
 Usage:
@@ -13,11 +13,21 @@ Usage:
 
 import psycopg2
 import clickhouse_driver
-from .schema_definitions import POSTGRES_SCHEMA, CLICKHOUSE_SCHEMA
+from .schema_definitions import POSTGRES_SCHEMA, CLICKHOUSE_SCHEMA, COUNTRIES
 
-def setup_postgres(config):
+# Built once the data is loaded, so the bulk load doesn't maintain them row by row
+POSTGRES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_payments_user_id ON payments(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_country ON payments(country)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_ts ON payments(ts)",
+]
+
+def setup_postgres_schema(config):
     """
-    Set up PostgreSQL database with the payments table.
+    Set up PostgreSQL database with the payments and country_codes tables
+    and the payments_decoded view.
+    
+    Indexes are not created here; call create_postgres_indexes after loading data.
     
     Args:
         config (dict): PostgreSQL connection configuration
@@ -42,17 +52,22 @@ def setup_postgres(config):
         
         # Get table info
         payments_table = POSTGRES_SCHEMA['tables']['payments']
+        country_codes_table = POSTGRES_SCHEMA['tables']['country_codes']
+        payments_view = POSTGRES_SCHEMA['views']['payments_decoded']
         
-        # Drop table if it exists
+        # Drop the view and tables if they exist
+        cursor.execute("DROP VIEW IF EXISTS payments_decoded")
         cursor.execute("DROP TABLE IF EXISTS payments")
+        cursor.execute("DROP TABLE IF EXISTS country_codes")
         
-        # Create table
+        # Create tables, filling in the country code lookup
+        cursor.execute(country_codes_table['create_sql'])
+        cursor.executemany(
+            "INSERT INTO country_codes (id, code) VALUES (%s, %s)",
+            list(enumerate(COUNTRIES))
+        )
         cursor.execute(payments_table['create_sql'])
-        
-        # Create any required indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_user_id ON payments(user_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_country ON payments(country)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_ts ON payments(ts)")
+        cursor.execute(payments_view['create_sql'])
         
         conn.commit()
         cursor.close()
@@ -65,6 +80,42 @@ def setup_postgres(config):
         print(f"Error setting up PostgreSQL: {e}")
         return False
 
+def create_postgres_indexes(config, conn=None):
+    """
+    Create the payments table indexes.
+    
+    Args:
+        config (dict): PostgreSQL connection configuration
+        conn: Open psycopg2 connection to use (and leave open) instead of
+            connecting with config
+    
+    Returns:
+        bool: True if the indexes were created, False otherwise
+    """
+    owns_conn = conn is None
+    try:
+        if owns_conn:
+            conn, cursor = get_postgres_connection(config)
+        else:
+            cursor = conn.cursor()
+        
+        for create_index_sql in POSTGRES_INDEXES:
+            cursor.execute(create_index_sql)
+        
+        conn.commit()
+        cursor.close()
+        if owns_conn:
+            conn.close()
+        
+        print("PostgreSQL indexes created successfully.")
+        return True
+    
+    except Exception as e:
+        if not owns_conn:
+            conn.rollback()
+        print(f"Error creating PostgreSQL indexes: {e}")
+        return False
+
 def setup_clickhouse(config):
     """
     Set up ClickHouse database with the user_velocity table.
@@ -117,7 +168,7 @@ def setup_databases(postgres_config, clickhouse_config):
     Returns:
         tuple: (postgres_success, clickhouse_success)
     """
-    pg_success = setup_postgres(postgres_config)
+    pg_success = setup_postgres_schema(postgres_config)
     ch_success = setup_clickhouse(clickhouse_config)
     
     if pg_success and ch_success:
@@ -0,0 +1,61 @@
+"""
+Example Trino queries for the Fraud Rule Copilot project.
+
+This module defines the cross-database query template used to evaluate fraud
+rules over the PostgreSQL and ClickHouse data, and example rules expressed as
+SQL WHERE clauses. It is kept apart from schema_definitions so that data
+generation does not load it.
+"""
+
+# Cross-database join examples using Trino
+TRINO_CROSS_DB_QUERY_TEMPLATE = """
+WITH candidates AS (
+  SELECT 
+    p.order_id,
+    p.user_id,
+    p.amount,
+    p.country,
+    p.shipping_country,
+    p.ts,
+    p.authorized,
+    p.fraud_label,
+    v.tx_last_24h,
+    v.first_seen_days
+  FROM 
+    postgresql.{pg_schema}.payments_decoded p
+  JOIN 
+    clickhouse.{ch_schema}.user_velocity v 
+  ON 
+    p.user_id = v.user_id
+  WHERE 
+    {where_clause}
+    AND p.ts BETWEEN date_add('day', -90, now()) AND now()
+)
+SELECT
+  count(*)                                  AS blocked,
+  sum(amount)                               AS blocked_value,
+  sum(CASE WHEN fraud_label=0 THEN 1 END)   AS false_positives,
+  sum(CASE WHEN fraud_label=1 THEN 1 END)   AS fraud_caught,
+  sum(CASE WHEN fraud_label=1 THEN amount ELSE 0 END) AS fraud_value_caught,
+  sum(CASE WHEN fraud_label=0 THEN amount ELSE 0 END) AS false_positive_value
+FROM 
+  candidates
+"""
+
+# Examples of fraud rules converted to SQL WHERE clauses
+EXAMPLE_FRAUD_RULES = {
+    "Block transactions above $500 from new accounts in Nigeria": 
+        "amount > 500 AND country = 'NG' AND first_seen_days < 7",
+    
+    "If card country doesn't match shipping country AND amount > $300, block": 
+        "country != shipping_country AND amount > 300",
+    
+    "Block users with more than 15 transactions in 24 hours": 
+        "tx_last_24h > 15",
+    
+    "Block transactions over $1000 from accounts less than 30 days old": 
+        "amount > 1000 AND first_seen_days < 30",
+    
+    "High-risk countries (Nigeria, South Africa, India) with transactions above $200": 
+        "country IN ('NG', 'ZA', 'IN') AND amount > 200"
+}
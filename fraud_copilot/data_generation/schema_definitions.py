@@ -2,13 +2,17 @@
 Schema definitions for the Fraud Rule Copilot project.
 
 This module defines the database schemas for:
-1. PostgreSQL: payments table
+1. PostgreSQL: payments and country_codes tables, and the payments_decoded view
 2. ClickHouse: user_velocity table
 
 These tables are designed to work together for fraud detection analytics using Trino
-to execute cross-database queries.
+to execute cross-database queries (see queries.py).
 """
 
+# Countries used in the data; a country's position is its code in
+# country_codes.id and in the payments country columns
+COUNTRIES = ['US', 'CA', 'UK', 'FR', 'DE', 'NG', 'ZA', 'IN', 'CN', 'JP', 'AU', 'BR', 'MX']
+
 # PostgreSQL schema definitions
 POSTGRES_SCHEMA = {
     "database_name": "trino",
@@ -34,13 +38,13 @@ POSTGRES_SCHEMA = {
                 },
                 {
                     "name": "country",
-                    "type": "VARCHAR(2) NOT NULL",
-                    "description": "Two-letter country code of the card/payment method"
+                    "type": "SMALLINT NOT NULL",
+                    "description": "Country of the card/payment method, as a country_codes.id"
                 },
                 {
                     "name": "shipping_country",
-                    "type": "VARCHAR(2) NOT NULL",
-                    "description": "Two-letter country code for the shipping address"
+                    "type": "SMALLINT NOT NULL",
+                    "description": "Country of the shipping address, as a country_codes.id"
                 },
                 {
                     "name": "ts",
@@ -63,13 +67,54 @@ POSTGRES_SCHEMA = {
                 order_id SERIAL PRIMARY KEY,
                 user_id INTEGER NOT NULL,
                 amount DECIMAL(10, 2) NOT NULL,
-                country VARCHAR(2) NOT NULL,
-                shipping_country VARCHAR(2) NOT NULL,
+                country SMALLINT NOT NULL,
+                shipping_country SMALLINT NOT NULL,
                 ts TIMESTAMP NOT NULL,
                 authorized BOOLEAN NOT NULL,
                 fraud_label INTEGER NOT NULL
             )
             """
+        },
+        "country_codes": {
+            "description": "Maps the numeric country codes stored in payments to two-letter codes",
+            "columns": [
+                {
+                    "name": "id",
+                    "type": "SMALLINT PRIMARY KEY",
+                    "description": "Numeric country code, the country's position in COUNTRIES"
+                },
+                {
+                    "name": "code",
+                    "type": "VARCHAR(2) NOT NULL UNIQUE",
+                    "description": "Two-letter country code"
+                }
+            ],
+            "create_sql": """
+            CREATE TABLE country_codes (
+                id SMALLINT PRIMARY KEY,
+                code VARCHAR(2) NOT NULL UNIQUE
+            )
+            """
+        }
+    },
+    "views": {
+        "payments_decoded": {
+            "description": "payments with both country columns resolved to two-letter codes",
+            "create_sql": """
+            CREATE VIEW payments_decoded AS
+            SELECT
+                p.order_id,
+                p.user_id,
+                p.amount,
+                c.code AS country,
+                s.code AS shipping_country,
+                p.ts,
+                p.authorized,
+                p.fraud_label
+            FROM payments p
+            JOIN country_codes c ON c.id = p.country
+            JOIN country_codes s ON s.id = p.shipping_country
+            """
         }
     }
 }
@@ -107,56 +152,3 @@ CLICKHOUSE_SCHEMA = {
         }
     }
 }
-
-# Cross-database join examples using Trino
-TRINO_CROSS_DB_QUERY_TEMPLATE = """
-WITH candidates AS (
-  SELECT 
-    p.order_id,
-    p.user_id,
-    p.amount,
-    p.country,
-    p.shipping_country,
-    p.ts,
-    p.authorized,
-    p.fraud_label,
-    v.tx_last_24h,
-    v.first_seen_days
-  FROM 
-    postgresql.{pg_schema}.payments p
-  JOIN 
-    clickhouse.{ch_schema}.user_velocity v 
-  ON 
-    p.user_id = v.user_id
-  WHERE 
-    {where_clause}
-    AND p.ts BETWEEN date_add('day', -90, now()) AND now()
-)
-SELECT
-  count(*)                                  AS blocked,
-  sum(amount)                               AS blocked_value,
-  sum(CASE WHEN fraud_label=0 THEN 1 END)   AS false_positives,
-  sum(CASE WHEN fraud_label=1 THEN 1 END)   AS fraud_caught,
-  sum(CASE WHEN fraud_label=1 THEN amount ELSE 0 END) AS fraud_value_caught,
-  sum(CASE WHEN fraud_label=0 THEN amount ELSE 0 END) AS false_positive_value
-FROM 
-  candidates
-"""
-
-# Examples of fraud rules converted to SQL WHERE clauses
-EXAMPLE_FRAUD_RULES = {
-    "Block transactions above $500 from new accounts in Nigeria": 
-        "amount > 500 AND country = 'NG' AND first_seen_days < 7",
-    
-    "If card country doesn't match shipping country AND amount > $300, block": 
-        "country != shipping_country AND amount > 300",
-    
-    "Block users with more than 15 transactions in 24 hours": 
-        "tx_last_24h > 15",
-    
-    "Block transactions over $1000 from accounts less than 30 days old": 
-        "amount > 1000 AND first_seen_days < 30",
-    
-    "High-risk countries (Nigeria, South Africa, India) with transactions above $200": 
-        "country IN ('NG', 'ZA', 'IN') AND amount > 200"
-}
@@ -40,6 +40,8 @@ def parse_args():
     data_group = parser.add_argument_group('Data generation options')
     data_group.add_argument('--num-users', type=int, default=5000, help='Number of users to generate')
     data_group.add_argument('--num-records', type=int, default=50000, help='Number of payment records to generate')
+    data_group.add_argument('--workers', type=int, default=1, help='Processes to split payment generation across')
+    data_group.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
     data_group.add_argument('--skip-db-setup', action='store_true', help='Skip database setup (table creation)')
     
     return parser.parse_args()
@@ -79,8 +81,14 @@ def main():
     
     # Generate and insert data
     print("\nGenerating and inserting synthetic data...")
-    data_generator = FraudDataGenerator(num_users=args.num_users, num_records=args.num_records)
-    pg_success, ch_success = data_generator.generate_and_insert_data(postgres_config, clickhouse_config)
+    data_generator = FraudDataGenerator(
+        num_users=args.num_users, num_records=args.num_records, workers=args.workers,
+        postgres_config=postgres_config, clickhouse_config=clickhouse_config, seed=args.seed
+    )
+    try:
+        pg_success, ch_success = data_generator.generate_and_insert_data()
+    finally:
+        data_generator.close()
     
     if pg_success and ch_success:
         print("\nData generation completed successfully!")
@@ -91,7 +99,7 @@ def main():
           p.order_id, p.user_id, p.amount, p.country, p.shipping_country, 
           p.fraud_label, v.tx_last_24h, v.first_seen_days
         FROM 
-          postgresql.public.payments p
+          postgresql.public.payments_decoded p
         JOIN 
           clickhouse.default.user_velocity v 
         ON 
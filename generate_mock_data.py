@@ -1,56 +1,58 @@
 #!/usr/bin/env python3
 """
 Generate synthetic data for Fraud Rule Copilot demo:
-- PostgreSQL: payments table
+- PostgreSQL: payments and country_codes tables, and the payments_decoded view
 - ClickHouse: user_velocity table
+
+The PostgreSQL schema is the one in fraud_copilot/data_generation/schema_definitions.py,
+which generate_data.py also loads.
 """
 
 import argparse
-import random
+import io
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import psycopg2
+from psycopg2.extras import execute_values
 import clickhouse_driver
-from faker import Faker
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
-
-# Initialize faker
-fake = Faker()
+from fraud_copilot.data_generation.schema_definitions import COUNTRIES, POSTGRES_SCHEMA
+# The fraud model (high-risk countries and the probability for each set of
+# risk flags) is shared with generate_data.py
+from fraud_copilot.data_generation.data_generator import (
+    HIGH_RISK_IDX, IS_HIGH_RISK_IDX, FRAUD_PROB_BY_FLAGS
+)
 
 # Constants
 NUM_RECORDS = 50000
 NUM_USERS = 5000
-COUNTRIES = ['US', 'CA', 'UK', 'FR', 'DE', 'NG', 'ZA', 'IN', 'CN', 'JP', 'AU', 'BR', 'MX']
-FRAUD_RATE = 0.05
-HIGH_RISK_COUNTRIES = ['NG', 'ZA', 'IN']
+INSERT_PAGE_SIZE = 10000  # Rows per multi-row INSERT when COPY is not used
 
 def setup_postgres_table(conn_string):
-    """Create payments table in PostgreSQL"""
+    """Create payments and country_codes tables and the payments_decoded view in PostgreSQL"""
     conn = psycopg2.connect(conn_string)
     cursor = conn.cursor()
     
-    # Drop table if exists
+    # Drop the view first; it depends on both tables
+    cursor.execute("DROP VIEW IF EXISTS payments_decoded")
     cursor.execute("DROP TABLE IF EXISTS payments")
+    cursor.execute("DROP TABLE IF EXISTS country_codes")
     
-    # Create table
-    cursor.execute("""
-    CREATE TABLE payments (
-        order_id SERIAL PRIMARY KEY,
-        user_id INTEGER NOT NULL,
-        amount DECIMAL(10, 2) NOT NULL,
-        country VARCHAR(2) NOT NULL,
-        shipping_country VARCHAR(2) NOT NULL,
-        ts TIMESTAMP NOT NULL,
-        authorized BOOLEAN NOT NULL,
-        fraud_label INTEGER NOT NULL
+    # Create tables, filling in the country code lookup
+    cursor.execute(POSTGRES_SCHEMA['tables']['country_codes']['create_sql'])
+    cursor.executemany(
+        "INSERT INTO country_codes (id, code) VALUES (%s, %s)",
+        list(enumerate(COUNTRIES))
     )
-    """)
+    cursor.execute(POSTGRES_SCHEMA['tables']['payments']['create_sql'])
+    cursor.execute(POSTGRES_SCHEMA['views']['payments_decoded']['create_sql'])
     
     conn.commit()
     cursor.close()
     conn.close()
-    print("PostgreSQL table 'payments' created.")
+    print("PostgreSQL tables 'payments' and 'country_codes' and view 'payments_decoded' created.")
 
 def setup_clickhouse_table(conn_params):
     """Create user_velocity table in ClickHouse"""
@@ -70,168 +72,162 @@ def setup_clickhouse_table(conn_params):
     
     print("ClickHouse table 'user_velocity' created.")
 
-def generate_user_data(num_users):
-    """Generate synthetic user data"""
-    users = []
-    
-    # Create base user profiles
-    for i in range(1, num_users + 1):
-        # Determine if user account is new (1-30 days) or established
-        is_new_account = random.random() < 0.3
-        first_seen_days = random.randint(1, 30) if is_new_account else random.randint(31, 730)
-        
-        # Transaction velocity - newer accounts tend to have lower velocity
-        if is_new_account:
-            tx_last_24h = max(1, int(np.random.exponential(2)))
-        else:
-            tx_last_24h = max(1, int(np.random.exponential(5)))
-        
-        users.append({
-            'user_id': i,
-            'tx_last_24h': tx_last_24h,
-            'first_seen_days': first_seen_days,
-            'is_high_risk': random.random() < 0.2  # 20% of users flagged as high risk
-        })
-    
-    return users
+def generate_user_data(num_users, rng):
+    """Generate synthetic user data as a dict of NumPy arrays, one entry per user"""
+    
+    # Determine if user account is new (1-30 days) or established
+    is_new_account = rng.random(num_users) < 0.3
+    first_seen_days = np.where(
+        is_new_account,
+        rng.integers(1, 31, num_users),
+        rng.integers(31, 731, num_users)
+    ).astype(np.uint16)
+    
+    # Transaction velocity - newer accounts tend to have lower velocity
+    tx_last_24h = np.maximum(1, rng.exponential(np.where(is_new_account, 2, 5)).astype(np.uint16))
+    
+    return {
+        'user_id': np.arange(1, num_users + 1, dtype=np.uint32),
+        'tx_last_24h': tx_last_24h,
+        'first_seen_days': first_seen_days,
+        'is_high_risk': rng.random(num_users) < 0.2  # 20% of users flagged as high risk
+    }
 
-def generate_payments_data(users):
-    """Generate payments data with fraud patterns embedded"""
-    payments = []
+def generate_payments_data(users, n, rng):
+    """Generate n payments with fraud patterns embedded"""
     
     # Set a fixed date range ending today and going back 120 days
     end_date = datetime.datetime.now()
     start_date = end_date - datetime.timedelta(days=120)
     date_range = (end_date - start_date).days
     
-    for i in tqdm(range(NUM_RECORDS), desc="Generating payment records"):
-        # Select a user
-        user = random.choice(users)
-        user_id = user['user_id']
-        is_high_risk = user['is_high_risk']
-        is_new_account = user['first_seen_days'] < 30
-        
-        # Generate transaction timestamp
-        days_ago = random.randint(0, date_range)
-        hours_ago = random.randint(0, 23)
-        minutes_ago = random.randint(0, 59)
-        ts = end_date - datetime.timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)
-        
-        # Generate countries
-        country = random.choice(HIGH_RISK_COUNTRIES) if is_high_risk and random.random() < 0.7 else random.choice(COUNTRIES)
-        
-        # Shipping country usually matches but sometimes doesn't
-        country_mismatch = random.random() < 0.15
-        shipping_country = random.choice(COUNTRIES) if country_mismatch else country
-        
-        # Generate transaction amount (log-normal distribution)
-        # Fraud transactions tend to be larger
-        if random.random() < 0.1:  # 10% high-value transactions
-            amount = round(random.uniform(500, 2000), 2)
-        else:
-            amount = round(random.uniform(10, 500), 2)
-        
-        # Determine fraud label based on risk factors
-        # Implement various fraud patterns:
-        
-        # Base fraud probability
-        fraud_prob = FRAUD_RATE
-        
-        # Increase for high-risk factors
-        if is_high_risk:
-            fraud_prob *= 3
-        
-        if is_new_account and amount > 300:
-            fraud_prob *= 2
-            
-        if country in HIGH_RISK_COUNTRIES and amount > 200:
-            fraud_prob *= 2.5
-            
-        if country_mismatch and amount > 250:
-            fraud_prob *= 3
-            
-        if user['tx_last_24h'] > 10:
-            fraud_prob *= 2
-            
-        # Cap probability at 0.9 to avoid deterministic outcomes
-        fraud_prob = min(fraud_prob, 0.9)
-        
-        # Determine fraud label
-        fraud_label = 1 if random.random() < fraud_prob else 0
-        
-        # Authentication is usually successful unless fraud
-        authorized = random.random() > (0.9 if fraud_label else 0.02)
-        
-        payments.append({
-            'user_id': user_id,
-            'amount': amount,
-            'country': country,
-            'shipping_country': shipping_country,
-            'ts': ts,
-            'authorized': authorized,
-            'fraud_label': fraud_label
-        })
-    
-    return payments
+    # Select a user for each record, gathering their attributes at once
+    user_idx = rng.integers(0, len(users['user_id']), n)
+    is_high_risk = users['is_high_risk'][user_idx]
+    is_new_account = users['first_seen_days'][user_idx] < 30
+    
+    # Generate transaction timestamps, up to date_range days, 23 hours and 59 minutes back
+    minutes_ago = rng.integers(0, (date_range + 1) * 24 * 60, n)
+    ts = np.datetime64(end_date, 'us') - minutes_ago.astype('timedelta64[m]')
+    
+    # Generate countries, as indexes into COUNTRIES
+    country = np.where(
+        is_high_risk & (rng.random(n) < 0.7),
+        HIGH_RISK_IDX[rng.integers(0, len(HIGH_RISK_IDX), n)],
+        rng.integers(0, len(COUNTRIES), n, dtype=np.uint8)
+    )
+    
+    # Shipping country usually matches but sometimes doesn't
+    country_mismatch = rng.random(n) < 0.15
+    shipping_country = np.where(
+        country_mismatch, rng.integers(0, len(COUNTRIES), n, dtype=np.uint8), country
+    )
+    
+    # Generate transaction amounts; 10% are high-value transactions. float32
+    # holds every DECIMAL(10,2) value generated here to the cent
+    amount = np.round(np.where(
+        rng.random(n) < 0.1,
+        rng.uniform(500, 2000, n),
+        rng.uniform(10, 500, n)
+    ).astype(np.float32), 2)
+    
+    # Determine fraud label based on risk factors: each record's rule flags
+    # form a 5-bit code, and the code picks its precomputed probability
+    risk_flags = is_high_risk.view(np.uint8).copy()
+    risk_flags |= (is_new_account & (amount > 300)).view(np.uint8) << 1
+    risk_flags |= (IS_HIGH_RISK_IDX[country] & (amount > 200)).view(np.uint8) << 2
+    risk_flags |= (country_mismatch & (amount > 250)).view(np.uint8) << 3
+    risk_flags |= (users['tx_last_24h'][user_idx] > 10).view(np.uint8) << 4
+    fraud_prob = FRAUD_PROB_BY_FLAGS[risk_flags]
+    
+    # Determine fraud label
+    fraud_label = (rng.random(n) < fraud_prob).astype(np.int8)
+    
+    # Authentication is usually successful unless fraud
+    authorized = rng.random(n) > np.where(fraud_label == 1, 0.9, 0.02)
+    
+    return pd.DataFrame({
+        'user_id': users['user_id'][user_idx],
+        'amount': amount,
+        # Country indexes are the country_codes ids stored in payments
+        'country': country,
+        'shipping_country': shipping_country,
+        'ts': ts,
+        'authorized': authorized,
+        'fraud_label': fraud_label
+    })
+
+def _generate_payments_shard(users, n, seed):
+    """Generate one shard of payments in a worker process"""
+    return generate_payments_data(users, n, np.random.default_rng(seed))
+
+def generate_payments_data_parallel(users, n, seed_seq, workers):
+    """Generate n payments split across worker processes, each shard with its own child seed"""
+    base, extra = divmod(n, workers)
+    sizes = [base + (shard < extra) for shard in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = executor.map(_generate_payments_shard, repeat(users), sizes, seed_seq.spawn(workers))
+        return pd.concat(shards, ignore_index=True)
 
-def insert_postgres_data(conn_string, payments):
-    """Insert payments data into PostgreSQL"""
+def insert_postgres_data(conn_string, payments, use_copy=True):
+    """Insert payments data into PostgreSQL with COPY, or multi-row INSERTs when use_copy is False"""
     conn = psycopg2.connect(conn_string)
     cursor = conn.cursor()
     
-    # Insert data in batches
-    batch_size = 1000
-    for i in tqdm(range(0, len(payments), batch_size), desc="Inserting into PostgreSQL"):
-        batch = payments[i:i+batch_size]
-        
-        args = []
-        for payment in batch:
-            args.append((
-                payment['user_id'],
-                payment['amount'],
-                payment['country'],
-                payment['shipping_country'],
-                payment['ts'],
-                payment['authorized'],
-                payment['fraud_label']
-            ))
-        
-        cursor.executemany(
-            """
-            INSERT INTO payments 
-            (user_id, amount, country, shipping_country, ts, authorized, fraud_label) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, 
-            args
-        )
+    # All rows load in one transaction with a single commit; closing without
+    # committing on failure rolls the whole load back
+    try:
+        if use_copy:
+            # Encode the frame as CSV column by column, without building row objects
+            buf = io.StringIO()
+            payments.to_csv(buf, index=False, header=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+            buf.seek(0)
+            
+            # One COPY in one transaction instead of a round trip per row
+            cursor.copy_expert(
+                "COPY payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buf
+            )
+        else:
+            # One INSERT ... VALUES (..), (..) statement per page, as native Python values
+            rows = zip(*(payments[column].tolist() for column in payments.columns))
+            execute_values(
+                cursor,
+                "INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label) VALUES %s",
+                rows,
+                page_size=INSERT_PAGE_SIZE
+            )
         conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
     
-    cursor.close()
-    conn.close()
     print(f"Inserted {len(payments)} records into PostgreSQL.")
 
 def insert_clickhouse_data(conn_params, users):
     """Insert user velocity data into ClickHouse"""
     client = clickhouse_driver.Client(**conn_params)
     
-    # Insert data in batches
+    # One list per column; the native protocol sends data column by column,
+    # so the driver has no rows to transpose
     user_data = [
-        (
-            user['user_id'],
-            user['tx_last_24h'],
-            user['first_seen_days']
-        )
-        for user in users
+        users['user_id'].tolist(),
+        users['tx_last_24h'].tolist(),
+        users['first_seen_days'].tolist()
     ]
     
     client.execute(
-        "INSERT INTO user_velocity VALUES", 
-        user_data
+        "INSERT INTO user_velocity (user_id, tx_last_24h, first_seen_days) VALUES", 
+        user_data,
+        columnar=True
     )
     
-    print(f"Inserted {len(users)} records into ClickHouse.")
+    print(f"Inserted {len(users['user_id'])} records into ClickHouse.")
 
 def main():
+    global NUM_RECORDS, NUM_USERS
+    
     parser = argparse.ArgumentParser(description='Generate mock data for Fraud Rule Copilot demo')
     parser.add_argument('--postgres-host', default='localhost', help='PostgreSQL host')
     parser.add_argument('--postgres-port', default='5432', help='PostgreSQL port')
@@ -245,11 +241,13 @@ def main():
     parser.add_argument('--clickhouse-db', default='default', help='ClickHouse database name')
     parser.add_argument('--num-records', type=int, default=NUM_RECORDS, help='Number of payment records')
     parser.add_argument('--num-users', type=int, default=NUM_USERS, help='Number of users')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
+    parser.add_argument('--workers', type=int, default=1, help='Processes to split payment generation across')
+    parser.add_argument('--no-copy', action='store_true', help='Load payments with INSERT statements instead of COPY')
     
     args = parser.parse_args()
     
     # Update globals
-    global NUM_RECORDS, NUM_USERS
     NUM_RECORDS = args.num_records
     NUM_USERS = args.num_users
     
@@ -278,14 +276,18 @@ def main():
     
     # Generate user data
     print(f"Generating data for {NUM_USERS} users and {NUM_RECORDS} payment transactions...")
-    users = generate_user_data(NUM_USERS)
+    user_seed, payments_seed = np.random.SeedSequence(args.seed).spawn(2)
+    users = generate_user_data(NUM_USERS, np.random.default_rng(user_seed))
     
     # Generate payment data
-    payments = generate_payments_data(users)
+    if args.workers > 1:
+        payments = generate_payments_data_parallel(users, NUM_RECORDS, payments_seed, args.workers)
+    else:
+        payments = generate_payments_data(users, NUM_RECORDS, np.random.default_rng(payments_seed))
     
     # Insert data
     try:
-        insert_postgres_data(postgres_conn_string, payments)
+        insert_postgres_data(postgres_conn_string, payments, use_copy=not args.no_copy)
     except Exception as e:
         print(f"Error inserting into PostgreSQL: {e}")
         return
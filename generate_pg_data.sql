@@ -1,24 +1,58 @@
--- Create payments table
+-- Same schema as fraud_copilot/data_generation/schema_definitions.py: country
+-- columns hold country_codes ids, and payments_decoded shows them as codes
+
+-- Drop the views first; they depend on the tables
+DROP VIEW IF EXISTS fraud_statistics;
+DROP VIEW IF EXISTS payments_decoded;
 DROP TABLE IF EXISTS payments;
+DROP TABLE IF EXISTS country_codes;
+
+-- Create the country code lookup; a country's id is its position in COUNTRIES
+CREATE TABLE country_codes (
+    id SMALLINT PRIMARY KEY,
+    code VARCHAR(2) NOT NULL UNIQUE
+);
 
+INSERT INTO country_codes (id, code) VALUES
+    (0, 'US'), (1, 'CA'), (2, 'UK'), (3, 'FR'), (4, 'DE'), (5, 'NG'), (6, 'ZA'),
+    (7, 'IN'), (8, 'CN'), (9, 'JP'), (10, 'AU'), (11, 'BR'), (12, 'MX');
+
+-- Create payments table
 CREATE TABLE payments (
     order_id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL,
     amount DECIMAL(10, 2) NOT NULL,
-    country VARCHAR(2) NOT NULL,
-    shipping_country VARCHAR(2) NOT NULL,
+    country SMALLINT NOT NULL,
+    shipping_country SMALLINT NOT NULL,
     ts TIMESTAMP NOT NULL,
     authorized BOOLEAN NOT NULL,
     fraud_label INTEGER NOT NULL
 );
 
+-- Create a view of payments with both country columns resolved to two-letter codes
+CREATE VIEW payments_decoded AS
+SELECT
+    p.order_id,
+    p.user_id,
+    p.amount,
+    c.code AS country,
+    s.code AS shipping_country,
+    p.ts,
+    p.authorized,
+    p.fraud_label
+FROM payments p
+JOIN country_codes c ON c.id = p.country
+JOIN country_codes s ON s.id = p.shipping_country;
+
 -- Create indexes for better performance
 CREATE INDEX idx_payments_user_id ON payments(user_id);
 CREATE INDEX idx_payments_country ON payments(country);
 CREATE INDEX idx_payments_ts ON payments(ts);
 
 -- Insert sample data (10 legitimate transactions)
-INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label) VALUES
+INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label)
+SELECT v.user_id, v.amount, c.id, s.id, v.ts, v.authorized, v.fraud_label
+FROM (VALUES
     (1, 120.50, 'US', 'US', now() - interval '5 days', true, 0),
     (2, 75.25, 'CA', 'CA', now() - interval '10 days', true, 0),
     (3, 200.00, 'UK', 'UK', now() - interval '15 days', true, 0),
@@ -28,15 +62,23 @@ INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized
     (7, 150.00, 'CA', 'CA', now() - interval '35 days', true, 0),
     (8, 180.25, 'UK', 'UK', now() - interval '40 days', true, 0),
     (9, 45.50, 'FR', 'FR', now() - interval '45 days', true, 0),
-    (10, 250.00, 'DE', 'DE', now() - interval '50 days', true, 0);
+    (10, 250.00, 'DE', 'DE', now() - interval '50 days', true, 0)
+) AS v(user_id, amount, country, shipping_country, ts, authorized, fraud_label)
+JOIN country_codes c ON c.code = v.country
+JOIN country_codes s ON s.code = v.shipping_country;
 
 -- Insert sample data (5 fraudulent transactions with patterns)
-INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label) VALUES
+INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label)
+SELECT v.user_id, v.amount, c.id, s.id, v.ts, v.authorized, v.fraud_label
+FROM (VALUES
     (11, 750.00, 'NG', 'US', now() - interval '7 days', false, 1),  -- High-risk country + mismatch
     (12, 1200.50, 'US', 'ZA', now() - interval '12 days', false, 1), -- High amount + shipping to high-risk
     (13, 500.00, 'NG', 'NG', now() - interval '18 days', false, 1),  -- High-risk country
     (14, 850.75, 'IN', 'UK', now() - interval '22 days', false, 1),  -- High-risk country + mismatch
-    (15, 1500.00, 'US', 'US', now() - interval '28 days', false, 1); -- Very high amount
+    (15, 1500.00, 'US', 'US', now() - interval '28 days', false, 1)  -- Very high amount
+) AS v(user_id, amount, country, shipping_country, ts, authorized, fraud_label)
+JOIN country_codes c ON c.code = v.country
+JOIN country_codes s ON s.code = v.shipping_country;
 
 -- Generate more data with a loop (approximately 500 random transactions)
 DO $$
@@ -122,7 +164,12 @@ BEGIN
         
         -- Insert the data
         INSERT INTO payments (user_id, amount, country, shipping_country, ts, authorized, fraud_label)
-        VALUES (user_id_var, amount_var, country_var, shipping_country_var, ts_var, authorized_var, fraud_label_var);
+        VALUES (
+            user_id_var, amount_var,
+            (SELECT id FROM country_codes WHERE code = country_var),
+            (SELECT id FROM country_codes WHERE code = shipping_country_var),
+            ts_var, authorized_var, fraud_label_var
+        );
     END LOOP;
 END $$;
 
@@ -140,7 +187,7 @@ FROM payments;
 SELECT * FROM fraud_statistics;
 SELECT COUNT(*) AS legitimate_transactions FROM payments WHERE fraud_label = 0;
 SELECT COUNT(*) AS fraudulent_transactions FROM payments WHERE fraud_label = 1;
-SELECT country, COUNT(*) FROM payments GROUP BY country ORDER BY COUNT(*) DESC;
+SELECT country, COUNT(*) FROM payments_decoded GROUP BY country ORDER BY COUNT(*) DESC;
 SELECT 
     COUNT(*) AS country_mismatch_count, 
     ROUND(AVG(amount)::NUMERIC, 2) AS avg_amount,
@@ -0,0 +1,14 @@
+# Production entrypoint: gunicorn -c gunicorn.conf.py app.main:app
+#
+# UvicornWorker selects uvloop and httptools when they are installed (they
+# come with uvicorn[standard]); responses already use ORJSONResponse.
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1)))
+loglevel = os.environ.get("LOG_LEVEL", "warning")
+# Import the app once in the master before forking, so module-level state such
+# as a generated JWT_SECRET_KEY is shared by every worker instead of each
+# worker signing tokens with its own random key
+preload_app = True
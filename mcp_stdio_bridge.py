@@ -7,6 +7,9 @@ This program:
 3. For the "initialize" method it responds locally with server info / capabilities.
 4. For every other request it POSTs the envelope to the FastAPI MCP server
    running at http://localhost:8000/mcp and writes back the response.
+   Requests are forwarded from a small thread pool, so a slow call does not
+   hold up the envelopes behind it; responses are written as they complete
+   and matched to requests by id.
 
 All logs are written to STDERR; every line written to STDOUT is a valid
 JSON document terminated by a single newline so Claude can parse it
@@ -14,91 +17,131 @@ reliably.
 """
 
 import sys
-import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
 
 MCP_SERVER_URL = "http://localhost:8000/mcp"
+FORWARD_WORKERS = 8  # requests in flight to the MCP server at once
 
 logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("mcp-stdio-bridge")
 
+# One session for the whole stream, so every envelope reuses the same
+# keep-alive connection to the MCP server
+SESSION = requests.Session()
+SESSION.headers["Content-Type"] = "application/json"
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=FORWARD_WORKERS))
+
+_stdout_lock = threading.Lock()
+
 # -------------------------------------------------------------
-# helper for sending error back
+# precomputed responses
 # -------------------------------------------------------------
 
-def _error(id_: Any, code: int, msg: str) -> None:
-    resp = {"jsonrpc": "2.0", "id": id_, "error": {"code": code, "message": msg}}
-    print(json.dumps(resp), flush=True)
+_INITIALIZE_RESULT = orjson.dumps({
+    "serverInfo": {"name": "trino-mcp-bridge", "version": "1.0.0"},
+    "capabilities": {
+        "methodSupport": {
+            "list_catalogs": True,
+            "list_schemas": True,
+            "list_tables": True,
+            "get_table_schema": True,
+            "run_query_sync": True,
+            "run_query_async": True,
+            "get_query_status": True,
+            "get_query_results": True,
+            "run_query_wait": True,
+        }
+    },
+})
+# Only the id varies, so it is spliced into the serialized result
+_INITIALIZE_TEMPLATE = b'{"jsonrpc":"2.0","id":%s,"result":%s}\n'
+_INITIALIZED_NOTIFICATION = orjson.dumps({"jsonrpc": "2.0", "method": "initialized"}) + b"\n"
+_ERROR_TEMPLATE = b'{"jsonrpc":"2.0","id":%s,"error":{"code":%d,"message":%s}}\n'
 
 # -------------------------------------------------------------
-# read ‑ process ‑ write loop (newline-delimited JSON-RPC)
+# helpers for writing to STDOUT
 # -------------------------------------------------------------
 
-for raw_line in sys.stdin:
-    line = raw_line.strip()
-    if not line:
-        continue  # skip blanks / keep-alive newlines
+def _write_line(data: bytes) -> None:
+    # The lock keeps lines from concurrent forwards whole
+    with _stdout_lock:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
 
+
+def _write(obj: Any) -> None:
+    # orjson output is compact, so each document is exactly one line
+    _write_line(orjson.dumps(obj) + b"\n")
+
+
+def _error(id_: Any, code: int, msg: str) -> None:
+    _write_line(_ERROR_TEMPLATE % (orjson.dumps(id_), code, orjson.dumps(msg)))
+
+# -------------------------------------------------------------
+# forward everything else to FastAPI MCP server
+# -------------------------------------------------------------
+
+def _forward(line: bytes, msg_id: Any) -> None:
     try:
-        envelope: Dict[str, Any] = json.loads(line)
-    except json.JSONDecodeError as exc:
-        logger.error(f"Invalid JSON from Claude: {exc}\n> {line}")
-        _error(None, -32700, "Parse error: invalid JSON")
-        continue
-
-    logger.info(f"← {envelope}")
-    msg_id = envelope.get("id")
-    method = envelope.get("method")
-
-    # ---------------------------------------------------------
-    # handle initialize locally
-    # ---------------------------------------------------------
-    if method == "initialize":
-        init_resp = {
-            "jsonrpc": "2.0",
-            "id": msg_id,
-            "result": {
-                "serverInfo": {"name": "trino-mcp-bridge", "version": "1.0.0"},
-                "capabilities": {
-                    "methodSupport": {
-                        "list_catalogs": True,
-                        "list_schemas": True,
-                        "list_tables": True,
-                        "get_table_schema": True,
-                        "run_query_sync": True,
-                        "run_query_async": True,
-                        "get_query_status": True,
-                        "get_query_results": True,
-                    }
-                },
-            },
-        }
-        print(json.dumps(init_resp), flush=True)
-        # Send required initialized notification so client knows server is ready
-        notify = {"jsonrpc": "2.0", "method": "initialized"}
-        print(json.dumps(notify), flush=True)
-        logger.info("→ initialize response + initialized notification sent")
-        continue
-
-    # ---------------------------------------------------------
-    # forward everything else to FastAPI MCP server
-    # ---------------------------------------------------------
-    try:
-        resp = requests.post(MCP_SERVER_URL, json=envelope, timeout=60)
+        # The line is already valid JSON; send it as is instead of re-encoding
+        resp = SESSION.post(MCP_SERVER_URL, data=line, timeout=60)
     except requests.RequestException as exc:
         logger.error(f"Error contacting MCP server: {exc}")
         _error(msg_id, -32000, f"Transport error: {exc}")
-        continue
+        return
 
     try:
-        data = resp.json()
-    except ValueError as exc:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError as exc:
         logger.error(f"MCP server returned non-JSON: {exc}\n{resp.text[:500]}")
         _error(msg_id, -32603, "Invalid JSON from MCP server")
-        continue
+        return
 
     # Ensure newline terminated
-    print(json.dumps(data), flush=True)
-    logger.info(f"→ response forwarded (id={msg_id})") 
\ No newline at end of file
+    _write(data)
+    logger.info(f"→ response forwarded (id={msg_id})")
+
+# -------------------------------------------------------------
+# read ‑ process ‑ write loop (newline-delimited JSON-RPC)
+# -------------------------------------------------------------
+
+# Leaving the with block waits for forwards still in flight at EOF
+with ThreadPoolExecutor(max_workers=FORWARD_WORKERS) as forwarder:
+    # Read raw bytes a line at a time: each envelope is handled as soon as its
+    # newline arrives, and orjson parses the bytes without a decode step
+    while raw_line := sys.stdin.buffer.readline():
+        line = raw_line.strip()
+        if not line:
+            continue  # skip blanks / keep-alive newlines
+
+        try:
+            envelope: Dict[str, Any] = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            logger.error(f"Invalid JSON from Claude: {exc}\n> {line.decode(errors='replace')}")
+            _error(None, -32700, "Parse error: invalid JSON")
+            continue
+
+        logger.info(f"← {envelope}")
+        msg_id = envelope.get("id")
+        method = envelope.get("method")
+
+        # ---------------------------------------------------------
+        # handle initialize locally
+        # ---------------------------------------------------------
+        if method == "initialize":
+            _write_line(_INITIALIZE_TEMPLATE % (orjson.dumps(msg_id), _INITIALIZE_RESULT))
+            # Send required initialized notification so client knows server is ready
+            _write_line(_INITIALIZED_NOTIFICATION)
+            logger.info("→ initialize response + initialized notification sent")
+            continue
+
+        # ---------------------------------------------------------
+        # forward everything else without waiting for the response
+        # ---------------------------------------------------------
+        forwarder.submit(_forward, line, msg_id)